@@ -1,7 +1,16 @@
 
 import pygame
 import random
-import heapq
+import sys
+import time
+from itertools import islice
+
+from board import DEFAULT_BOARD
+from body import Apple, Body, FreeCells
+from connectivity import ConnectivityIndex
+from pathfinding import GridSearch, IncrementalSearch, longest_path
+import live
+from render import ArrayRenderer
 
 # Define the colors
 BLACK = (0, 0, 0)
@@ -10,12 +19,12 @@ RED = (255, 0, 0)
 BLUE = (0, 0, 255)
 YELLOW = (255, 255, 0)
 
-# Game dimensions
-SCREEN_WIDTH = 480
-SCREEN_HEIGHT = 480
-GRIDSIZE = 20
-GRID_WIDTH = SCREEN_WIDTH // GRIDSIZE
-GRID_HEIGHT = SCREEN_HEIGHT // GRIDSIZE
+# Palette de la grille pour render.ArrayRenderer: 0 case libre, 1 et plus segments du corps,
+# puis les couleurs dessinées par-dessus (chemin et pomme)
+PALETTE = [BLACK] + [GREEN] * 253 + [BLUE, RED]
+
+# Game dimensions: plateau par défaut, chaque serpent peut recevoir le sien
+BOARD = DEFAULT_BOARD
 
 # Directions
 UP = (0, -1)
@@ -23,58 +32,48 @@ DOWN = (0, 1)
 LEFT = (-1, 0)
 RIGHT = (1, 0)
 
-def heuristic(a, b):
-    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+# Temps de réflexion par tick dans la fenêtre, en secondes: la moitié d'un tick à 100 ticks par seconde
+DEADLINE = 0.005
 
-def a_star_search(grid, start, goal, snake_positions):
-    directions = [DOWN, RIGHT, UP, LEFT]  # DOWN, RIGHT, UP, LEFT
-    close_set = set()
-    came_from = {}
-    gscore = {start: 0}
-    fscore = {start: heuristic(start, goal)}
-    open_set = []
+# Recherches réutilisées d'un appel à l'autre, une par taille de plateau, voir pathfinding.GridSearch
+SEARCHES = {}
 
-    heapq.heappush(open_set, (fscore[start], start))
-    
-    while open_set:
-        _, current = heapq.heappop(open_set)
-
-        if current == goal:
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            return path[::-1]
-
-        close_set.add(current)
-        for dx, dy in directions:
-            neighbor = (current[0] + dx, current[1] + dy)
-            if 0 <= neighbor[0] < GRID_WIDTH and 0 <= neighbor[1] < GRID_HEIGHT:
-                if grid[neighbor[1]][neighbor[0]] == 1:  # Position is blocked by the snake's body
-                    continue
-                if neighbor in close_set:
-                    continue
-
-                tentative_g_score = gscore[current] + 1  # Every step has a cost of 1
-                if tentative_g_score < gscore.get(neighbor, float('inf')):
-                    came_from[neighbor] = current
-                    gscore[neighbor] = tentative_g_score
-                    fscore[neighbor] = tentative_g_score + heuristic(neighbor, goal)
-                    heapq.heappush(open_set, (fscore[neighbor], neighbor))
-
-    return []  # If no path is found
+
+def a_star_search(grid, start, goal, snake_positions, board=BOARD):
+    search = SEARCHES.get((board.width, board.height))
+    if search is None:
+        search = SEARCHES[(board.width, board.height)] = GridSearch(board.width, board.height)
+    return search.search(grid, start, goal)
 
 
 class Snake:
-    def __init__(self):
+    def __init__(self, board=BOARD, rng=random):
+        self.board = board
+        self.rng = rng  # générateur de la partie: module random par défaut, ou un random.Random(seed)
         self.length = 3
-        self.positions = [(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)]
-        self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
+        self.positions = Body([board.center], FreeCells(board.cells))
+        self.direction = self.rng.choice([UP, DOWN, LEFT, RIGHT])
         self.color = GREEN
         self.score = 0
         self.steps = 0
         self.path = []  # Ajout de l'initialisation de path ici
-
+        # Grille d'occupation persistante, indexée par case: nombre de segments, queue exclue
+        # sauf si elle est retenue (self.tail_held), quand le serpent doit encore grandir.
+        # Un octet par case dans un seul tampon, modifié sur place et jamais réalloué:
+        # self.view le montre en lecture seule aux observateurs et au rendu, sans copie.
+        self.grid = bytearray(board.cells)
+        self.view = board.view(self.grid)
+        # Régions libres de la grille, tenues à jour avec elle
+        self.space = ConnectivityIndex(board.width, board.height, self.grid)
+        # Planificateur incrémental et cases changées depuis son dernier appel
+        self.planner = IncrementalSearch(board.width, board.height)
+        self.rebuild_grid()
+        self.profiler = None  # profiling.Profiler pour mesurer chaque tick, désactivé par défaut
+        # Temps de réflexion accordé à move, en secondes, et nombre de cases qu'il peut développer,
+        # la même limite sans dépendre de l'horloge (None: sans limite); nombre de fois où l'un a manqué
+        self.deadline = None
+        self.budget = None
+        self.deadline_hits = 0
 
     def get_head_position(self):
         return self.positions[0]
@@ -86,176 +85,279 @@ class Snake:
             self.direction = point
     
     
-    def move(self, apple, grid):
-        update_grid(grid, self.positions)  # Leave the last segment free since it will be vacated
-        start = (self.get_head_position()[0] // GRIDSIZE, self.get_head_position()[1] // GRIDSIZE)
-        goal = (apple.position[0] // GRIDSIZE, apple.position[1] // GRIDSIZE)
+    def push_head(self, cell):
+        # La nouvelle tête devient un obstacle; l'ancienne tête l'était déjà
+        self.grid[cell] += 1
+        if self.grid[cell] == 1:
+            self.space.block_cell(cell)
+        self.changed.append(cell)
+        self.positions.push_head(cell)
+
+    def pop_tail(self):
+        # La queue quitte sa case et le segment précédent devient la nouvelle queue, laissée libre
+        self.positions.pop_tail()
+        tail = self.positions[-1]
+        self.grid[tail] -= 1
+        if self.grid[tail] == 0:
+            self.space.free_cell(tail)
+        self.changed.append(tail)
+
+    def hold_tail(self):
+        # Tant que le serpent doit grandir, sa queue ne bougera pas au prochain tick: elle reste un obstacle.
+        # Elle n'est libérée qu'au tick où elle quitte vraiment sa case.
+        held = len(self.positions) < self.length
+        if held == self.tail_held:
+            return
+        self.tail_held = held
+        tail = self.positions[-1]
+        if held:
+            self.grid[tail] += 1
+            if self.grid[tail] == 1:
+                self.space.block_cell(tail)
+        else:
+            self.grid[tail] -= 1
+            if self.grid[tail] == 0:
+                self.space.free_cell(tail)
+        self.changed.append(tail)
+
+    def rebuild_grid(self):
+        # Reconstruction complète de la grille, des régions et du planificateur, pour un nouveau corps
+        self.tail_held = len(self.positions) < self.length
+        update_grid(self.grid, self.positions, self.board, self.tail_held)
+        self.space.rebuild(self.grid)
+        self.planner.reset()
+        self.changed = []
+
+    def plan_path(self, start, goal, deadline=None, limit=None):
+        # Répare le chemin du tick précédent au lieu de relancer a_star_search
+        profiler = self.profiler
+        if profiler:
+            began = profiler.clock()
+            expansions = self.planner.expansions
+        path = self.planner.plan(self.grid, start, goal, self.changed, deadline, limit)
+        self.changed.clear()
+        if profiler:
+            profiler.add("search", profiler.clock() - began)
+            profiler.add("expanded", self.planner.expansions - expansions)
+        return path
+
+    def move(self, apple):
+        # Les décisions ne sont plus affichées avec print: elles sont comptées par self.profiler s'il y en a un
+        profiler = self.profiler
+        grid = self.grid  # Tenue à jour par push_head, pop_tail et hold_tail
+        start = self.get_head_position()
+        goal = apple.position
         head_position = self.get_head_position()
-        head_x, head_y = head_position[0], head_position[1]
-        self.path = a_star_search(grid, start, goal, self.positions)
+        previous = self.path
+        deadline = None if self.deadline is None else time.perf_counter() + self.deadline
+        limit = None if self.budget is None else self.planner.expansions + self.budget
+        self.path = self.plan_path(start, goal, deadline, limit)
+        if self.planner.interrupted:
+            return self.move_late(apple, previous)
         
         if self.path:
-            next_step = self.path[0]  # Prenez le premier pas du chemin
-            new_head_position = (next_step[0] * GRIDSIZE, next_step[1] * GRIDSIZE)
+            new_head_position = self.path[0]  # Prenez le premier pas du chemin
 
             # Vérifiez si la nouvelle position est sur le corps du serpent
-            if new_head_position in self.positions[:-1] or not self.is_move_safe(grid, new_head_position):
-                if not self.is_move_safe(grid, new_head_position):
-                    print("Not safe, recalculating path.")
-                print("Collision detected, recalculating path.")
-                # Corriger les indices ici
-                head_pos = self.get_head_position()
-                head_grid_x = head_pos[0] // GRIDSIZE
-                head_grid_y = head_pos[1] // GRIDSIZE
-                apple_grid_x = apple.position[0] // GRIDSIZE
-                apple_grid_y = apple.position[1] // GRIDSIZE
-                self.path = a_star_search(grid, (head_grid_x, head_grid_y), (apple_grid_x, apple_grid_y), self.positions)
+            collision = self.positions.contains(new_head_position, skip_tail=0 if self.tail_held else 1)
+            if not collision:
+                began = profiler and profiler.clock()
+                safe = self.is_move_safe(grid, new_head_position)
+                if profiler:
+                    profiler.add("safety", profiler.clock() - began)
+            if collision or not safe:
+                if profiler:
+                    profiler.add("collisions" if collision else "unsafe")
+                    profiler.add("replans")
+                self.path = self.plan_path(self.get_head_position(), apple.position, deadline, limit)
+                if self.planner.interrupted:
+                    return self.move_late(apple, previous)
                 if not self.path:
                     # Aucun chemin sécurisé trouvé, temporiser
-                    print("Still no safe path, temporizing.")
+                    began = profiler and profiler.clock()
                     direction_to_temporize = self.find_space_for_temporizing(grid)
+                    if profiler:
+                        profiler.add("temporize", profiler.clock() - began)
                     if direction_to_temporize:
                         new_head_position = self.get_temporized_position(direction_to_temporize, head_position)
                     else:
-                        print("No safe move available.")
-                        return
-            else:
-                # Continue avec le mouvement
-                self.positions.insert(0, new_head_position)
-                if len(self.positions) > self.length:
-                    self.positions.pop()
-
-                # Gestion de la pomme
-                if new_head_position == apple.position:
-                    self.length += 1
-                    self.score += 1
-                    apple.randomize(self.positions)
-                    
+                        if profiler:
+                            profiler.add("stuck")
+                        return True
+
         if not self.path:  # No safe path was found or the original path was unsafe
-            print("No safe path found or risky path, temporizing.")
-            direction_to_temporize = self.find_space_for_temporizing(grid)
-            if direction_to_temporize:
-                new_head_position = self.get_temporized_position(direction_to_temporize, head_position)
+            # Suivre sa queue par le plus long chemin trouvé dans le budget, sinon temporiser
+            # Avec un budget de cases, seul ce qu'il en reste borne la recherche: le tick ne dépend plus de l'horloge
+            time_budget = 0.002 if limit is None else None
+            node_budget = None
+            if deadline is not None:
+                time_budget = min(0.002, deadline - time.perf_counter())
+                if time_budget <= 0:
+                    return self.move_late(apple, previous)
+            if limit is not None:
+                node_budget = limit - self.planner.expansions
+                if node_budget <= 0:
+                    return self.move_late(apple, previous)
+            began = profiler and profiler.clock()
+            if profiler:
+                profiler.add("temporized")
+            tail = self.positions[-1]
+            tail_path = self.find_longest_path_to_tail(grid, start, tail, (), time_budget, node_budget)
+            # Une queue retenue ne libère pas sa case: la tête ne peut que s'en approcher
+            if len(tail_path) > 1 and not (self.tail_held and tail_path[1] == tail):
+                new_head_position = tail_path[1]
             else:
-                print("No safe move available. Temporizing might not be possible.")
-                return  # Might consider other strategies or halt movement
+                direction_to_temporize = self.find_space_for_temporizing(grid)
+                if direction_to_temporize:
+                    new_head_position = self.get_temporized_position(direction_to_temporize, head_position)
+                else:
+                    if profiler:
+                        profiler.add("temporize", profiler.clock() - began)
+                        profiler.add("stuck")
+                    return True  # Might consider other strategies or halt movement
+            if profiler:
+                profiler.add("temporize", profiler.clock() - began)
+
+        return self.advance(new_head_position, apple)
+
+    def move_late(self, apple, previous):
+        # Échéance ou budget atteint: le pas suivant du chemin précédent s'il est toujours sûr,
+        # sinon la case voisine qui ouvre la plus grande région libre
+        profiler = self.profiler
+        self.deadline_hits += 1
+        if profiler:
+            profiler.add("deadline")
+        head_position = self.get_head_position()
+        if len(previous) > 1 and previous[0] == head_position and self.is_move_safe(self.grid, previous[1]):
+            self.path = previous[1:]
+            return self.advance(self.path[0], apple)
+        self.path = []
+        direction_to_temporize = self.find_space_for_temporizing(self.grid)
+        if not direction_to_temporize:
+            if profiler:
+                profiler.add("stuck")
+            return True
+        return self.advance(self.get_temporized_position(direction_to_temporize, head_position), apple)
+
+    def advance(self, new_head_position, apple):
+        # La tête qui entre dans le corps (queue comprise si elle est retenue) tue le serpent
+        if self.positions.contains(new_head_position, skip_tail=0 if self.tail_held else 1):
+            return True
 
         # Perform the safe movement
-        self.positions.insert(0, new_head_position)
+        profiler = self.profiler
+        began = profiler and profiler.clock()
+        visited = self.space.visited
+        self.push_head(new_head_position)
         if len(self.positions) > self.length:
-            self.positions.pop()
+            self.pop_tail()
+        if profiler:
+            profiler.add("grid", profiler.clock() - began)
+            profiler.add("visited", self.space.visited - visited)
 
         # Handle eating the apple
         if new_head_position == apple.position:
             self.length += 1
             self.score += 1
+            began = profiler and profiler.clock()
             apple.randomize(self.positions)
-            
+            if profiler:
+                profiler.add("respawn", profiler.clock() - began)
+        began = profiler and profiler.clock()
+        self.hold_tail()
+        if profiler:
+            profiler.add("grid", profiler.clock() - began)
+        return False
+
     def get_temporized_position(self, direction, head_position):
         # Calculate new position based on the direction
         if direction == 'UP':
-            return (head_position[0], head_position[1] - GRIDSIZE)
+            return self.board.neighbor(head_position, UP)
         elif direction == 'DOWN':
-            return (head_position[0], head_position[1] + GRIDSIZE)
+            return self.board.neighbor(head_position, DOWN)
         elif direction == 'LEFT':
-            return (head_position[0] - GRIDSIZE, head_position[1])
+            return self.board.neighbor(head_position, LEFT)
         elif direction == 'RIGHT':
-            return (head_position[0] + GRIDSIZE, head_position[1])
+            return self.board.neighbor(head_position, RIGHT)
 
 
     def reset(self):
         self.length = 3
-        self.positions = [(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)]
-        self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
+        self.positions = Body([self.board.center], FreeCells(self.board.cells))
+        self.direction = self.rng.choice([UP, DOWN, LEFT, RIGHT])
         self.score = 0
         self.steps = 0
         self.temp = False
+        self.rebuild_grid()
+
+    def layers(self):
+        # Couches dessinées par render.DirtyRenderer: le chemin en bleu par-dessus le corps
+        return [(self.positions, self.color, True), (self.path, BLUE, False)]
+
+    def overlays(self, apple):
+        # Ce que render.ArrayRenderer dessine par-dessus la grille: la queue, qu'elle peut laisser libre, le chemin, la pomme
+        overlays = [([self.positions[-1]], self.color), (self.path, BLUE)]
+        if apple.position is not None:
+            overlays.append(([apple.position], apple.color))
+        return overlays
 
     def draw(self, surface):
         # Dessiner le serpent
+        size = self.board.cell_size
         for p in self.positions:
-            r = pygame.Rect((p[0], p[1]), (GRIDSIZE, GRIDSIZE))
+            r = pygame.Rect(self.board.to_pixels(p), (size, size))
             pygame.draw.rect(surface, self.color, r)
             pygame.draw.rect(surface, BLACK, r, 1)
 
         # Dessiner le chemin en bleu
         if self.path:
             for step in self.path:
-                r = pygame.Rect((step[0] * GRIDSIZE, step[1] * GRIDSIZE), (GRIDSIZE, GRIDSIZE))
+                r = pygame.Rect(self.board.to_pixels(step), (size, size))
                 pygame.draw.rect(surface, BLUE, r)
                 
-    def find_longest_path_to_tail(self, grid, start, tail, body):
-        def dfs(current, path, visited):
-            if current == tail:
-                return path
-            longest_path = []
-            for direction in [(0, 1), (1, 0), (0, -1), (-1, 0)]:  # DOWN, RIGHT, UP, LEFT
-                neighbor = (current[0] + direction[0], current[1] + direction[1])
-                if (0 <= neighbor[0] < GRID_WIDTH and 
-                    0 <= neighbor[1] < GRID_HEIGHT and 
-                    neighbor not in visited and 
-                    neighbor not in body):
-                    
-                    visited.add(neighbor)
-                    sub_path = dfs(neighbor, path + [neighbor], visited)
-                    visited.remove(neighbor)
-                    
-                    if len(sub_path) > len(longest_path):
-                        longest_path = sub_path
-            return longest_path
-
-        visited = set([start])
-        return dfs(start, [start], visited) 
-    
+    def find_longest_path_to_tail(self, grid, start, tail, body, time_budget=0.002, node_budget=None):
+        # Plus court chemin vers la queue rallongé par détours, dans la limite du budget
+        def is_free(cell):
+            return cell == tail or (not grid[cell] and cell not in body)
+
+        return longest_path(is_free, start, tail, self.board.width, self.board.height, time_budget, node_budget)
 
     def find_space_for_temporizing(self, grid):
-        head_x, head_y = self.get_head_position()
+        head = self.get_head_position()
         directions = {
-            'UP': (head_x, head_y - GRIDSIZE),
-            'DOWN': (head_x, head_y + GRIDSIZE),
-            'LEFT': (head_x - GRIDSIZE, head_y),
-            'RIGHT': (head_x + GRIDSIZE, head_y)
+            'UP': self.board.neighbor(head, UP),
+            'DOWN': self.board.neighbor(head, DOWN),
+            'LEFT': self.board.neighbor(head, LEFT),
+            'RIGHT': self.board.neighbor(head, RIGHT)
         }
         max_space = 0
         best_direction = None
 
-        for direction, (new_x, new_y) in directions.items():
-            if (0 <= new_x < SCREEN_WIDTH and 0 <= new_y < SCREEN_HEIGHT and
-                (new_x, new_y) not in self.positions):
+        for direction, cell in directions.items():
+            if cell >= 0 and cell not in self.positions:
                 # Faire un appel récursif ou itératif pour calculer l'espace ouvert.
-                space = self.calculate_open_space(grid, (new_x // GRIDSIZE, new_y // GRIDSIZE), set())
+                space = self.calculate_open_space(grid, cell)
                 if space > max_space:
                     max_space = space
                     best_direction = direction
         
         return best_direction
 
-    def calculate_open_space(self, grid, start, visited):
-        if start in visited or not (0 <= start[0] < GRID_WIDTH) or not (0 <= start[1] < GRID_HEIGHT):
+    def calculate_open_space(self, grid, start):
+        # Taille de la zone libre contenant la case start, lue dans l'index de connectivité
+        if not (0 <= start < self.board.cells):
             return 0
-        if grid[start[1]][start[0]] == 1:  # Obstacle or part of the snake's body
+        if grid[start]:  # Obstacle or part of the snake's body
             return 0
-        
-        visited.add(start)
-        space = 1  # Include the current cell
-        for dx, dy in [(0, 1), (1, 0), (0, -1), (-1, 0)]:  # DOWN, RIGHT, UP, LEFT
-            next_cell = (start[0] + dx, start[1] + dy)
-            space += self.calculate_open_space(grid, next_cell, visited)
-        
-        return space
-    
-    def is_move_safe(self, grid, new_head_position):
-        # Convertit la position en indices de grille
-        grid_x = new_head_position[0] // GRIDSIZE
-        grid_y = new_head_position[1] // GRIDSIZE
+        return self.space.region_size(start)
 
-        # Vérifie si la position est dans les limites et libre
-        if not (0 <= grid_x < GRID_WIDTH and 0 <= grid_y < GRID_HEIGHT and grid[grid_y][grid_x] == 0):
+    def is_move_safe(self, grid, new_head_position):
+        # Vérifie si la case est dans les limites et libre
+        if not (0 <= new_head_position < self.board.cells and grid[new_head_position] == 0):
             return False
 
         # Calcule l'espace ouvert disponible autour de la nouvelle position de la tête
-        visited = set([(grid_x, grid_y)])
-        open_space = self.calculate_open_space(grid, (grid_x, grid_y), visited)
+        open_space = self.calculate_open_space(grid, new_head_position)
 
         # Utilisez une fraction de la longueur du serpent comme seuil. Par exemple, la moitié de la longueur actuelle du serpent.
         # Cela garantit qu'il y a suffisamment de place pour que le serpent ne se retrouve pas immédiatement bloqué.
@@ -265,34 +367,11 @@ class Snake:
         return open_space > safe_threshold
 
 
-
-
-
-class Apple:
-    def __init__(self, snake):
-        self.position = (0, 0)
-        self.color = RED
-        self.randomize(snake.positions)
-
-    def randomize(self, snake_positions):
-        while True:
-            new_position = (
-                random.randint(0, GRID_WIDTH - 1) * GRIDSIZE,
-                random.randint(0, GRID_HEIGHT - 1) * GRIDSIZE,
-            )
-            if new_position not in snake_positions:
-                break
-        self.position = new_position
-
-    def draw(self, surface):
-        r = pygame.Rect((self.position[0], self.position[1]), (GRIDSIZE, GRIDSIZE))
-        pygame.draw.rect(surface, self.color, r)
-        pygame.draw.rect(surface, BLACK, r, 1)
-        
-def draw_grid(surface):
-    for y in range(0, int(GRID_HEIGHT)):
-        for x in range(0, int(GRID_WIDTH)):
-            r = pygame.Rect((x * GRIDSIZE, y * GRIDSIZE), (GRIDSIZE, GRIDSIZE))
+def draw_grid(surface, board=BOARD):
+    size = board.cell_size
+    for y in range(0, int(board.height)):
+        for x in range(0, int(board.width)):
+            r = pygame.Rect((x * size, y * size), (size, size))
             pygame.draw.rect(surface, BLACK, r)
 
 # def check_eat(snake, apple):
@@ -302,55 +381,64 @@ def draw_grid(surface):
 #         snake.score += 1
 #         apple.randomize(snake.positions)
         
-def update_grid(grid, snake_positions):
-    # Initialiser toute la grille à 0
-    for y in range(GRID_HEIGHT):
-        for x in range(GRID_WIDTH):
-            grid[y][x] = 0
+def update_grid(grid, snake_positions, board=BOARD, keep_tail=False):
+    # Reconstruction complète, seulement à la création et au reset du serpent:
+    # ensuite Snake.push_head, Snake.pop_tail et Snake.hold_tail tiennent la grille à jour.
+    # keep_tail compte aussi la queue, pour un serpent qui grandit encore.
+    # Initialiser toute la grille à 0, sur place: les vues du tampon restent valables
+    grid[:] = bytes(board.cells)
 
     # Marquer le corps du serpent comme obstacles
-    for pos in snake_positions[:-1]:  # Excluez la queue si le serpent va se déplacer
-        grid[pos[1] // GRIDSIZE][pos[0] // GRIDSIZE] = 1
-        
+    end = len(snake_positions) if keep_tail else len(snake_positions) - 1
+    for pos in islice(snake_positions, end):  # Excluez la queue si le serpent va se déplacer
+        grid[pos] += 1
+
 
-def main():
+def tick(snake, apple):
+    # Un pas de simulation, sans affichage. Renvoie True si le serpent est bloqué ou entre dans son corps.
+    if apple.complete:
+        return False  # Plateau rempli: plus de pomme, la partie est gagnée
+    profiler = snake.profiler
+    if profiler is None:
+        return snake.move(apple)
+    profiler.begin()
+    died = snake.move(apple)
+    profiler.end(died)
+    return died
+
+
+def main(board=BOARD, turbo=False):
     pygame.init()
     pygame.font.init()
-    font = pygame.font.SysFont("monospace", 16)
     
-    screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-    clock = pygame.time.Clock()
+    screen = pygame.display.set_mode((board.screen_width, board.screen_height))
+    # Copie la grille du serpent vers l'écran en un bloc, quelle que soit sa longueur
+    renderer = ArrayRenderer(screen, board, PALETTE)
     
-    snake = Snake()
+    snake = Snake(board)
+    snake.deadline = DEADLINE  # un tick trop long ne doit pas figer l'affichage
     apple = Apple(snake)
-    
-    grid = [[0 for _ in range(GRID_WIDTH)] for _ in range(GRID_HEIGHT)]
-    
 
-    while True:
-        snake.move(apple, grid)
+    def step():
+        tick(snake, apple)
         # check_eat(snake, apple)
-        
-        screen.fill(BLACK)
-        snake.draw(screen)
-        apple.draw(screen)
-
-        # Mettre à jour le score et les étapes ici avant l'update de l'écran
-        text_score = font.render("Score {0}".format(snake.score), 1, (255, 255, 255))
-        screen.blit(text_score, (5, 10))
-        text_steps = font.render("Steps {0}".format(snake.steps), 1, (255, 255, 255))
-        screen.blit(text_steps, (5, 30))
-        
-        pygame.display.update()
-        clock.tick(100)
-
         snake.steps += 1
 
+    def draw():
+        # L'image montre le dernier état simulé, à son propre rythme
+        renderer.render(snake.view, snake.overlays(apple), ["Score {0}".format(snake.score), "Steps {0}".format(snake.steps)])
+
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
-                return
+                return False
+
+    # 100 ticks par seconde affichés à 60 images par seconde, ou en turbo le plus vite possible
+    if turbo:
+        live.run(step, draw)
+    else:
+        live.run(step, draw, tick_rate=100, fps=60)
 
 
 if __name__ == "__main__":
-    main()
+    main(turbo="--turbo" in sys.argv[1:])
@@ -0,0 +1,206 @@
+"""Vectorized snake engine stepping many boards in lockstep.
+
+Each board follows the rules of ``snake_basis.Snake.move``: the snake starts
+with one cell in the middle of the board and a target length of 3, grows by
+one on every apple, and restarts when its head hits its own body. With
+``wrap=True`` the board is a torus like in ``snake_basis``; with
+``wrap=False`` leaving the board is a death, as the walls of ``a_star``.
+
+The bodies are stored as ring buffers of flat cell indices, so a step only
+touches the new head and the vacated tail of every board. Cells are numbered
+column by column, ``x * height + y``, like ``Board`` cells: ``head``,
+``apple`` and the bodies can be passed to ``Board.xy`` or ``Board.to_pixels``.
+Only the occupancy is laid out row by row, ``(height, width)`` like an image,
+so that ``boards()`` is a plain view; ``site[cell]`` is the place of a cell
+in a row of ``occupancy``.
+
+    python batch_engine.py   # throughput against the per-object loop
+"""
+import time
+
+import numpy as np
+
+from board import DEFAULT_BOARD
+
+# Actions, in the order of snake_basis directions
+UP, DOWN, LEFT, RIGHT = 0, 1, 2, 3
+DX = np.array([0, 0, -1, 1], dtype=np.int64)
+DY = np.array([-1, 1, 0, 0], dtype=np.int64)
+OPPOSITE = np.array([DOWN, UP, RIGHT, LEFT], dtype=np.int64)
+
+INITIAL_LENGTH = 3
+APPLE_ATTEMPTS = 8
+
+
+class BatchGame:
+    def __init__(self, n, width=DEFAULT_BOARD.width, height=DEFAULT_BOARD.height, wrap=True, seed=None):
+        self.n = n
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.wrap = wrap
+        self.rng = np.random.default_rng(seed)
+        self.start_cell = (width // 2) * height + height // 2  # Board.center
+        self.next_cell = neighbor_table(width, height, wrap)
+        self.site, self.cell_at = site_tables(width, height)
+        self.row_offset = np.arange(n, dtype=np.int64) * self.cells
+
+        self.occupancy = np.zeros((n, self.cells), dtype=bool)  # indexée par site[case]
+        self.body = np.zeros((n, self.cells), dtype=np.int64)  # ring buffer, body[i, head_ptr] is the head
+        self.head_ptr = np.zeros(n, dtype=np.int64)
+        self.size = np.zeros(n, dtype=np.int64)  # cells currently on the board
+        self.length = np.zeros(n, dtype=np.int64)  # target length, grows on apples
+        self.direction = np.zeros(n, dtype=np.int64)
+        self.apple = np.zeros(n, dtype=np.int64)
+        self.score = np.zeros(n, dtype=np.int64)
+        self.final_score = np.zeros(n, dtype=np.int64)  # score of the last finished game of each board
+        self.reset()
+
+    @property
+    def head(self):
+        return self.body.reshape(-1)[self.row_offset + self.head_ptr]
+
+    @property
+    def tail(self):
+        return self.body.reshape(-1)[self.row_offset + (self.head_ptr - self.size + 1) % self.cells]
+
+    def boards(self):
+        # Vue (n, height, width) de l'occupation, sans copie
+        return self.occupancy.reshape(self.n, self.height, self.width)
+
+    def reset(self, mask=None):
+        index = np.arange(self.n) if mask is None else np.flatnonzero(mask)
+        if not len(index):
+            return
+        self.occupancy[index] = False
+        self.occupancy[index, self.site[self.start_cell]] = True
+        self.head_ptr[index] = 0
+        self.body[index, 0] = self.start_cell
+        self.size[index] = 1
+        self.length[index] = INITIAL_LENGTH
+        self.score[index] = 0
+        self.direction[index] = self.rng.integers(0, 4, len(index))
+        self.randomize_apples(index)
+
+    def randomize_apples(self, index):
+        # Tirage par rejet comme Apple.randomize, quelques essais vectorisés par plateau
+        # Les tirages portent sur les places de l'occupation, converties en cases à la fin
+        for _ in range(APPLE_ATTEMPTS):
+            if not len(index):
+                return
+            sites = self.rng.integers(0, self.cells, len(index))
+            free = ~self.occupancy[index, sites]
+            self.apple[index[free]] = self.cell_at[sites[free]]
+            index = index[~free]
+        if not len(index):
+            return
+        # Plateaux presque pleins: la case libre de plus grande clé aléatoire
+        keys = self.rng.random((len(index), self.cells))
+        keys[self.occupancy[index]] = -1.0
+        choice = keys.argmax(axis=1)
+        full = keys[np.arange(len(index)), choice] < 0
+        # Plateau plein: plus de pomme
+        self.apple[index] = np.where(full, -1, self.cell_at[choice])
+
+    def step(self, actions):
+        """Advance every board by one move and return the ``(eaten, died)`` masks.
+
+        ``actions`` holds one of UP, DOWN, LEFT, RIGHT per board; turning back
+        onto the neck is ignored, as in ``Snake.turn``. Boards whose snake died
+        are reset before returning, their score is kept in ``final_score``.
+        """
+        actions = np.asarray(actions, dtype=np.int64)
+        occupancy = self.occupancy.reshape(-1)
+        body = self.body.reshape(-1)
+        rows = self.row_offset
+
+        # La longueur cible vaut toujours au moins 3: un demi-tour est toujours ignoré
+        self.direction = np.where(actions == OPPOSITE[self.direction], self.direction, actions)
+        head = body[rows + self.head_ptr]
+        new = self.next_cell[head * 4 + self.direction]
+
+        # Comme snake_basis: la queue compte encore comme obstacle au moment du test.
+        # Les plateaux morts sont mis à jour comme les autres puis réinitialisés.
+        died = new < 0
+        new[died] = self.start_cell
+        slot = rows + self.site[new]
+        died |= occupancy[slot]
+
+        ptr = self.head_ptr + 1
+        ptr[ptr == self.cells] = 0
+        self.head_ptr = ptr
+        body[rows + ptr] = new
+        occupancy[slot] = True
+        self.size += 1
+
+        shrink = self.size > self.length
+        tail = rows + self.site[body[rows + (ptr - self.length) % self.cells]]
+        occupancy[tail] &= ~shrink
+        self.size -= shrink
+
+        eaten = (new == self.apple) & ~died
+        self.length += eaten
+        self.score += eaten
+        self.randomize_apples(np.flatnonzero(eaten))
+
+        if died.any():
+            self.final_score[died] = self.score[died]
+            self.reset(died)
+        return eaten, died
+
+
+def neighbor_table(width, height, wrap):
+    # next_cell[cell * 4 + action]: case atteinte depuis cell, -1 si on sort du plateau
+    x = np.repeat(np.arange(width), height)
+    y = np.tile(np.arange(height), width)
+    nx = x[:, None] + DX[None, :]
+    ny = y[:, None] + DY[None, :]
+    if wrap:
+        nx %= width
+        ny %= height
+        table = nx * height + ny
+    else:
+        inside = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+        table = np.where(inside, nx * height + ny, -1)
+    return table.reshape(-1)
+
+
+def site_tables(width, height):
+    # site[case]: place y * width + x de la case x * height + y dans une ligne d'occupation; cell_at l'inverse
+    cells = np.arange(width * height)
+    site = cells % height * width + cells // height
+    cell_at = np.empty_like(site)
+    cell_at[site] = cells
+    return site, cell_at
+
+
+def benchmark(n=4096, steps=200, seed=0):
+    # Compare le pas vectorisé à la boucle Snake.move de snake_basis, sur 256 serpents
+    import random
+
+    import snake_basis
+
+    rng = np.random.default_rng(seed)
+    game = BatchGame(n, seed=seed)
+    start = time.perf_counter()
+    for _ in range(steps):
+        game.step(rng.integers(0, 4, n))
+    batch_rate = n * steps / (time.perf_counter() - start)
+
+    random.seed(seed)
+    snakes = [snake_basis.Snake() for _ in range(256)]
+    apples = [snake_basis.Apple(snake) for snake in snakes]
+    directions = [snake_basis.UP, snake_basis.DOWN, snake_basis.LEFT, snake_basis.RIGHT]
+    start = time.perf_counter()
+    for _ in range(steps):
+        for snake, apple in zip(snakes, apples):
+            snake.turn(random.choice(directions))
+            snake.move(apple)
+            snake_basis.check_eat(snake, apple)
+    loop_rate = len(snakes) * steps / (time.perf_counter() - start)
+    return batch_rate, loop_rate
+
+
+if __name__ == "__main__":
+    batch_rate, loop_rate = benchmark()
+    print("batch: {0:.0f} moves/s, loop: {1:.0f} moves/s, x{2:.1f}".format(batch_rate, loop_rate, batch_rate / loop_rate))
@@ -0,0 +1,229 @@
+"""Benchmarks of the planners' hot paths on seeded boards.
+
+Every benchmark runs on the same fixtures: boards of 24x24, 64x64 and
+256x256 cells where the snake covers 5% ("sparse"), 50% ("half") or 90%
+("full") of the board. The body is a stretch of the board's Hamiltonian cycle
+starting at a seeded random rank, and the apple a seeded random free cell, so
+a fixture only depends on its size, fill and seed.
+
+Each benchmark is timed for at least ``--min-time`` seconds. Planners with
+caches (the Fusion transposition table and mobility costs) are timed cold,
+with their caches cleared before every call. The results are written as
+JSON, one entry per size, fill and benchmark, so two runs can be compared:
+
+    python benchmark.py --out before.json
+    python benchmark.py --out after.json --compare before.json
+"""
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+
+import a_star
+import snake as hamiltonian
+import snakeFusion as fusion
+from board import Board
+from body import Body, FreeCells
+
+SIZES = [24, 64, 256]
+FILLS = {"sparse": 0.05, "half": 0.5, "full": 0.9}
+
+
+class Fixture:
+    """A seeded snake body and apple on a ``size`` x ``size`` board."""
+
+    def __init__(self, size, fill, seed=0):
+        self.size = size
+        self.fill = fill
+        self.board = Board(size, size)
+        rng = random.Random("{0}-{1}-{2}".format(size, fill, seed))
+        cycle = hamiltonian.HamiltonianCycle(self.board, self.board.center)
+        length = max(3, int(self.board.cells * FILLS[fill]))
+        tail = rng.randrange(cycle.size)
+        # Tête en premier: le corps remonte le cycle depuis la tête jusqu'à la queue
+        self.cells = [cycle.position_at(tail + length - 1 - i) for i in range(length)]
+        self.free = FreeCells(self.board.cells, self.cells)
+        self.apple = self.free.sample(rng)
+        self.rng = rng
+
+    @property
+    def head(self):
+        return self.cells[0]
+
+    def body(self):
+        # Le corps retire lui-même ses cases du pool des cases libres
+        return Body(self.cells, FreeCells(self.board.cells))
+
+    def free_neighbor(self):
+        # Première case libre à côté de la tête, celle où l'on teste un déplacement
+        for cell, _, _ in self.board.neighbors[self.head]:
+            if cell in self.free:
+                return cell
+        return self.head
+
+
+def a_star_snake(fixture):
+    # Serpent de a_star posé sur le corps de la fixture, avec sa grille et ses régions
+    snake = a_star.Snake(fixture.board)
+    snake.positions = fixture.body()
+    snake.length = len(snake.positions)
+    snake.rebuild_grid()
+    return snake
+
+
+def fusion_snake(fixture):
+    snake = fusion.Snake(fixture.board)
+    snake.positions = fixture.body()
+    snake.length = len(snake.positions)
+    return snake
+
+
+def cold_fusion(board):
+    # Vide les caches de Fusion: table de transposition et coûts de mobilité
+    graph = fusion.graph_for(board)
+    graph.table.clear()
+    graph.body_key = None
+
+
+def benchmarks(fixture):
+    """``(name, call, setup)`` of every benchmark on ``fixture``; ``setup`` may be ``None``."""
+    board = fixture.board
+    target = fixture.free_neighbor()
+
+    snake = a_star_snake(fixture)
+    grid = snake.grid
+    yield "a_star.a_star_search", lambda: a_star.a_star_search(grid, fixture.head, fixture.apple, snake.positions, board), None
+    yield "a_star.Snake.calculate_open_space", lambda: snake.calculate_open_space(grid, target), None
+    yield "a_star.Snake.is_move_safe", lambda: snake.is_move_safe(grid, target), None
+    yield "a_star.Snake.find_space_for_temporizing", lambda: snake.find_space_for_temporizing(grid), None
+
+    body = set(fixture.cells)
+    graph = fusion.graph_for(board)
+    cold = lambda: cold_fusion(board)  # noqa: E731
+    yield "snakeFusion.dijkstra", lambda: fusion.dijkstra(graph, fixture.head, fixture.apple, body), cold
+    yield "snakeFusion.simulate_future_mobility", lambda: fusion.simulate_future_mobility(target, body, 3, board), cold
+
+    survivor = fusion_snake(fixture)
+    apple = fusion.Apple(survivor, fixture.rng)
+    apple.position = fixture.apple
+
+    def reset_survivor():
+        survivor.path = []
+        cold_fusion(board)
+
+    yield "snakeFusion.move_survival", lambda: fusion.move_survival(survivor, apple), reset_survivor
+
+    cycle = hamiltonian.HamiltonianCycle(board, fixture.head)
+    yield "HamiltonianCycle.generate_cycle", cycle.generate_cycle, None
+    yield "HamiltonianCycle.next_position", lambda: cycle.next_position(fixture.head), None
+
+    spawner = a_star.Apple(snake, fixture.rng)
+    yield "Apple.randomize", lambda: spawner.randomize(snake.positions), None
+
+
+def measure(call, setup=None, min_time=0.2, min_calls=3):
+    """Per-call times in seconds, for ``min_time`` seconds and at least ``min_calls`` calls.
+
+    Without ``setup``, calls are timed in batches so that the timer does not
+    dominate fast calls, and each time is the batch mean.
+    """
+    timer = time.perf_counter
+    times = []
+    batch = 1
+    if setup is None:
+        # Taille de lot pour qu'un lot dure au moins une milliseconde
+        while True:
+            start = timer()
+            for _ in range(batch):
+                call()
+            if timer() - start >= 1e-3:
+                break
+            batch *= 10
+    deadline = timer() + min_time
+    while len(times) < min_calls or timer() < deadline:
+        if setup is not None:
+            setup()
+        start = timer()
+        for _ in range(batch):
+            call()
+        times.append((timer() - start) / batch)
+    return times, batch
+
+
+def run(sizes=SIZES, fills=tuple(FILLS), only=None, seed=0, min_time=0.2, log=None):
+    results = []
+    for size in sizes:
+        for fill in fills:
+            fixture = Fixture(size, fill, seed)
+            for name, call, setup in benchmarks(fixture):
+                if only and not any(pattern in name for pattern in only):
+                    continue
+                times, batch = measure(call, setup, min_time)
+                result = {
+                    "size": size,
+                    "fill": fill,
+                    "length": len(fixture.cells),
+                    "benchmark": name,
+                    "calls": len(times) * batch,
+                    "mean": statistics.fmean(times),
+                    "median": statistics.median(times),
+                    "min": min(times),
+                }
+                results.append(result)
+                if log:
+                    log(result)
+    return results
+
+
+def row(result, baseline=None):
+    line = "{0:>4} {1:<7} {2:<42} {3:>12.1f} us {4:>8} calls".format(
+        result["size"], result["fill"], result["benchmark"], result["median"] * 1e6, result["calls"]
+    )
+    if baseline is not None:
+        line += "  x{0:.2f}".format(result["median"] / baseline["median"])
+    return line
+
+
+def key(result):
+    return result["size"], result["fill"], result["benchmark"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time the planners' hot paths on seeded boards.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES, help="board sides to run")
+    parser.add_argument("--fills", nargs="+", choices=list(FILLS), default=list(FILLS))
+    parser.add_argument("--only", nargs="+", default=None, help="run the benchmarks whose name contains one of these")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the fixtures")
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds spent on each benchmark")
+    parser.add_argument("--out", default=None, help="write the results to this JSON file")
+    parser.add_argument("--compare", default=None, help="JSON file of a previous run to compare the medians with")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = {key(result): result for result in json.load(f)["results"]}
+
+    results = run(
+        args.sizes, args.fills, args.only, args.seed, args.min_time,
+        log=lambda result: print(row(result, baseline.get(key(result))), flush=True),
+    )
+
+    if args.out:
+        report = {
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "seed": args.seed,
+            "min_time": args.min_time,
+            "results": results,
+        }
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Board geometry shared by the engine, the planners and the renderer.
+
+A ``Board`` is a grid of ``width`` by ``height`` cells drawn ``cell_size``
+pixels wide. Each snake receives its board, and everything that used to read
+the module constants (``GRID_WIDTH``, ``GRIDSIZE``...) reads it from there, so
+games on boards of different sizes can run side by side in one process.
+
+Cells are flat integer indices numbered column by column, ``x * height + y``,
+like in ``pathfinding``: the game state, the planners and their tables all
+work on these numbers, and only the renderer turns them into pixels.
+"""
+from functools import cached_property
+
+from pathfinding import grid_neighbors
+
+
+class Board:
+    def __init__(self, width=24, height=24, cell_size=20):
+        if width < 1 or height < 1 or cell_size < 1:
+            raise ValueError("invalid board {0}x{1} with cells of {2} pixels".format(width, height, cell_size))
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.cells = width * height
+        self.screen_width = width * cell_size
+        self.screen_height = height * cell_size
+
+    @property
+    def center(self):
+        # Case du milieu, pour un nombre pair ou impair de cases
+        return self.cell(self.width // 2, self.height // 2)
+
+    def cell(self, x, y):
+        return x * self.height + y
+
+    def xy(self, cell):
+        return divmod(cell, self.height)
+
+    def neighbor(self, cell, direction):
+        """Cell next to ``cell`` in ``direction`` ``(dx, dy)``, or -1 off the board."""
+        x, y = divmod(cell, self.height)
+        x += direction[0]
+        y += direction[1]
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return x * self.height + y
+        return -1
+
+    def wrap(self, cell, direction):
+        # Case voisine sur un plateau torique, comme dans snake_basis
+        x, y = divmod(cell, self.height)
+        return ((x + direction[0]) % self.width) * self.height + (y + direction[1]) % self.height
+
+    def distance(self, a, b):
+        # Distance de Manhattan entre deux cases
+        ax, ay = divmod(a, self.height)
+        bx, by = divmod(b, self.height)
+        return abs(ax - bx) + abs(ay - by)
+
+    def view(self, buffer, writeable=False):
+        """NumPy array of shape ``(width, height)`` over ``buffer``, one byte per cell, without a copy.
+
+        Cells being numbered column by column, ``view[x, y]`` is the byte of
+        cell ``(x, y)``, the layout ``pygame.surfarray`` expects. The view is
+        read-only unless ``writeable`` is set.
+        """
+        import numpy as np
+
+        array = np.frombuffer(buffer, dtype=np.uint8, count=self.cells).reshape(self.width, self.height)
+        array.flags.writeable = writeable
+        return array
+
+    @cached_property
+    def neighbors(self):
+        # Table (voisine, x, y) de pathfinding, partagée par les plateaux de même taille
+        return grid_neighbors(self.width, self.height)
+
+    def to_pixels(self, cell):
+        # Seule conversion vers les pixels, pour le rendu
+        x, y = divmod(cell, self.height)
+        return (x * self.cell_size, y * self.cell_size)
+
+    def __eq__(self, other):
+        return isinstance(other, Board) and (self.width, self.height, self.cell_size) == (
+            other.width, other.height, other.cell_size
+        )
+
+    def __hash__(self):
+        return hash((self.width, self.height, self.cell_size))
+
+    def __repr__(self):
+        return "Board({0}, {1}, {2})".format(self.width, self.height, self.cell_size)
+
+
+# Plateau des jeux d'origine: 480x480 pixels, cases de 20
+DEFAULT_BOARD = Board(24, 24, 20)
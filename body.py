@@ -0,0 +1,158 @@
+"""Snake body shared by all the snakes.
+
+A deque of cells, head first, plus the number of segments on each cell, so
+that adding a head, removing the tail and testing whether a cell is covered
+are all O(1) and never copy the body.
+
+A body can also keep the ``FreeCells`` of its board up to date, for the
+``Apple`` of every game to spawn on a uniformly drawn free cell in O(1).
+"""
+import random
+from collections import deque
+
+
+class FreeCells:
+    """Cells of the board not covered by the body, with O(1) updates and sampling.
+
+    The first ``len(self)`` entries of ``cells`` are the free cells and
+    ``slot[cell]`` is where each cell sits in ``cells``: a cell is removed by
+    swapping it with the last free one.
+    """
+
+    def __init__(self, size, occupied=()):
+        self.cells = list(range(size))
+        self.slot = list(range(size))
+        self.size = size
+        for cell in occupied:
+            self.remove(cell)
+
+    def remove(self, cell):
+        i = self.slot[cell]
+        last = self.size - 1
+        other = self.cells[last]
+        self.cells[i] = other
+        self.slot[other] = i
+        self.cells[last] = cell
+        self.slot[cell] = last
+        self.size = last
+
+    def add(self, cell):
+        i = self.slot[cell]
+        first = self.size
+        other = self.cells[first]
+        self.cells[i] = other
+        self.slot[other] = i
+        self.cells[first] = cell
+        self.slot[cell] = first
+        self.size = first + 1
+
+    def sample(self, rng=random):
+        """A free cell drawn uniformly with ``rng``, or ``None`` when the board is full."""
+        if not self.size:
+            return None
+        return self.cells[rng.randrange(self.size)]
+
+    def __contains__(self, cell):
+        return self.slot[cell] < self.size
+
+    def __len__(self):
+        return self.size
+
+
+class Body:
+    def __init__(self, cells=(), free=None):
+        self.cells = deque()
+        self.count = {}
+        self.free = free  # FreeCells du plateau, tenues à jour si fournies
+        for cell in cells:
+            self.cells.append(cell)
+            self.cover(cell)
+
+    def cover(self, cell):
+        n = self.count.get(cell, 0)
+        self.count[cell] = n + 1
+        if not n and self.free is not None:
+            self.free.remove(cell)
+
+    def push_head(self, cell):
+        self.cells.appendleft(cell)
+        self.cover(cell)
+
+    def pop_tail(self):
+        cell = self.cells.pop()
+        remaining = self.count[cell] - 1
+        if remaining:
+            self.count[cell] = remaining
+        else:
+            del self.count[cell]
+            if self.free is not None:
+                self.free.add(cell)
+        return cell
+
+    def contains(self, cell, skip_head=0, skip_tail=0):
+        # Équivaut à `cell in positions[skip_head:len(positions) - skip_tail]`, sans copie
+        n = self.count.get(cell, 0)
+        if not n:
+            return False
+        size = len(self.cells)
+        skip_head = min(skip_head, size)
+        skip_tail = min(skip_tail, size - skip_head)
+        for i in range(skip_head):
+            if self.cells[i] == cell:
+                n -= 1
+        for i in range(1, skip_tail + 1):
+            if self.cells[-i] == cell:
+                n -= 1
+        return n > 0
+
+    def __contains__(self, cell):
+        return cell in self.count
+
+    def __getitem__(self, index):
+        # Accès en O(1) aux extrémités (tête: 0, queue: -1)
+        return self.cells[index]
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __repr__(self):
+        return "Body({0!r})".format(list(self.cells))
+
+
+class Apple:
+    """The apple of a game, shared by all the snakes.
+
+    It draws from ``rng``, by default the game's generator (``snake.rng``),
+    and spawns on the free cells kept by the snake's body. ``position`` is
+    ``None`` once the snake has filled the board.
+    """
+
+    color = (255, 0, 0)
+
+    def __init__(self, snake, rng=None):
+        self.board = snake.board
+        self.rng = snake.rng if rng is None else rng
+        self.position = None
+        self.randomize(snake.positions)
+
+    def randomize(self, snake_positions):
+        # Tirage uniforme parmi les cases libres que le corps tient à jour, en O(1)
+        self.position = snake_positions.free.sample(self.rng)
+        return self.position is not None
+
+    @property
+    def complete(self):
+        return self.position is None
+
+    def draw(self, surface):
+        import pygame
+
+        if self.position is None:
+            return
+        size = self.board.cell_size
+        r = pygame.Rect(self.board.to_pixels(self.position), (size, size))
+        pygame.draw.rect(surface, self.color, r)
+        pygame.draw.rect(surface, (0, 0, 0), r, 1)
@@ -0,0 +1 @@
+# Fichier présent pour que pytest ajoute la racine du dépôt au chemin d'import des tests
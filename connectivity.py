@@ -0,0 +1,175 @@
+"""Connected regions of the free cells, kept up to date as the snake moves.
+
+Cells are numbered like in ``pathfinding`` (``x * height + y``). Every free
+cell carries the label of its region and every region the set of its cells,
+so the size of the region around a cell is a lookup.
+
+Freeing a cell (the tail leaving) merges the regions around it, relabelling
+the smaller ones. Blocking a cell (the head entering) can only split its
+region when the cell is a cut vertex. Most of the time the free neighbors are
+still joined through the eight cells around it, which is checked locally.
+Otherwise one breadth-first search per neighbor is run in turns: a search
+that runs out of cells has found a separated piece, so the work stays
+proportional to the pieces cut off, not to the board.
+"""
+from collections import deque
+
+from pathfinding import grid_neighbors
+
+# Les huit cases autour d'une case, dans l'ordre du tour: N, NE, E, SE, S, SW, W, NW
+RING = [(0, -1), (1, -1), (1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1)]
+
+
+class ConnectivityIndex:
+    def __init__(self, width, height, grid):
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.neighbors = grid_neighbors(width, height)
+        self.visited = 0  # cases parcourues par les parcours en largeur, pour profiling
+        self.rebuild(grid)
+
+    def rebuild(self, grid):
+        # Étiquetage complet, à la création et au reset du serpent
+        self.free = [not blocked for blocked in grid]
+        self.label = [-1] * self.cells
+        self.members = {}
+        self.next_label = 0
+        for cell in range(self.cells):
+            if self.free[cell] and self.label[cell] < 0:
+                region = self.flood(cell)
+                self.add_region(region)
+
+    def flood(self, start):
+        # Parcours en largeur itératif des cases libres reliées à start
+        free = self.free
+        neighbors = self.neighbors
+        region = {start}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            for neighbor, _, _ in neighbors[current]:
+                if free[neighbor] and neighbor not in region:
+                    region.add(neighbor)
+                    queue.append(neighbor)
+        self.visited += len(region)
+        return region
+
+    def add_region(self, region):
+        label = self.next_label
+        self.next_label += 1
+        self.members[label] = region
+        for cell in region:
+            self.label[cell] = label
+        return label
+
+    def region_size(self, cell):
+        """Number of free cells in the region of ``cell``, 0 if it is blocked."""
+        label = self.label[cell]
+        return len(self.members[label]) if label >= 0 else 0
+
+    def free_cell(self, cell):
+        """The cell becomes free: it joins, and merges, the regions around it."""
+        self.free[cell] = True
+        labels = {self.label[neighbor] for neighbor, _, _ in self.neighbors[cell] if self.free[neighbor]}
+        labels.discard(-1)
+        if not labels:
+            self.add_region({cell})
+            return
+        # On garde la plus grande région et on y renomme les autres
+        kept = max(labels, key=lambda label: len(self.members[label]))
+        region = self.members[kept]
+        region.add(cell)
+        self.label[cell] = kept
+        for label in labels:
+            if label != kept:
+                other = self.members.pop(label)
+                for member in other:
+                    self.label[member] = kept
+                region |= other
+
+    def block_cell(self, cell):
+        """The cell becomes blocked: its region loses it and may split."""
+        label = self.label[cell]
+        self.free[cell] = False
+        self.label[cell] = -1
+        region = self.members[label]
+        region.discard(cell)
+        if not region:
+            del self.members[label]
+            return
+        starts = [neighbor for neighbor, _, _ in self.neighbors[cell] if self.free[neighbor]]
+        if len(starts) < 2 or self.locally_connected(cell):
+            return
+        for piece in self.separated_pieces(starts, cell):
+            region -= piece
+            self.add_region(piece)
+
+    def locally_connected(self, cell):
+        # Les voisins libres se rejoignent-ils par les huit cases du tour ?
+        free = self.free
+        width, height = self.width, self.height
+        x, y = divmod(cell, height)
+        ring = [
+            0 <= x + dx < width and 0 <= y + dy < height and free[(x + dx) * height + y + dy]
+            for dx, dy in RING
+        ]
+        if all(ring):
+            return True
+        blocked = ring.index(False)
+        run = 0
+        runs = set()
+        for i in range(blocked + 1, blocked + 8):
+            i %= 8
+            if not ring[i]:
+                run += 1
+            elif i % 2 == 0:  # N, E, S, W: les voisins directs
+                runs.add(run)
+        return len(runs) <= 1
+
+    def separated_pieces(self, starts, cell):
+        # Un parcours par voisin, avancés tour à tour en traitant cell comme bloquée.
+        # Deux parcours qui se rencontrent fusionnent; un parcours épuisé est une pièce séparée.
+        free = self.free
+        neighbors = self.neighbors
+        owner = {cell: -1}
+        searches = {}
+        for i, start in enumerate(starts):
+            owner[start] = i
+            searches[i] = ({start}, deque([start]))
+        pieces = []
+        explored = 0
+        while len(searches) > 1:
+            for i in list(searches):
+                if i not in searches:
+                    continue  # absorbé pendant ce tour
+                visited, frontier = searches[i]
+                if not frontier:
+                    del searches[i]
+                    pieces.append(visited)
+                    if len(searches) == 1:
+                        self.visited += explored
+                        return pieces
+                    continue
+                current = frontier.popleft()
+                explored += 1
+                for neighbor, _, _ in neighbors[current]:
+                    if not free[neighbor]:
+                        continue
+                    j = owner.get(neighbor)
+                    if j is None:
+                        owner[neighbor] = i
+                        visited.add(neighbor)
+                        frontier.append(neighbor)
+                    elif j != i and j >= 0:
+                        # Rencontre: la plus petite recherche rejoint la plus grande
+                        small, large = (i, j) if len(visited) < len(searches[j][0]) else (j, i)
+                        small_visited, small_frontier = searches.pop(small)
+                        for member in small_visited:
+                            owner[member] = large
+                        searches[large][0].update(small_visited)
+                        searches[large][1].extend(small_frontier)
+                        i = large
+                        visited, frontier = searches[i]
+        self.visited += explored
+        return pieces
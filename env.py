@@ -0,0 +1,134 @@
+"""Gym-style environments for the rules of ``snake_basis``.
+
+``SnakeEnv`` plays one ``snake_basis.Snake`` on a wrapping board: the agent
+picks one of the four directions every step. ``VectorSnakeEnv`` steps many
+boards per call on top of ``batch_engine.BatchGame`` and resets the finished
+ones on the spot.
+
+Observations are uint8 arrays of shape ``(3, height, width)`` (with a
+leading batch axis for ``VectorSnakeEnv``): the body, head and apple planes.
+Rewards are +1 for an apple, -1 for a death and 0 otherwise; an episode also
+ends when the snake fills the board. The API follows Gym's
+(``reset(seed)``, ``step(action)`` returning ``obs, reward, done, info``)
+without depending on it.
+
+    env = VectorSnakeEnv(256, seed=0)
+    obs = env.reset()
+    obs, rewards, dones, info = env.step(actions)
+"""
+import random
+
+import numpy as np
+
+import snake_basis
+from batch_engine import BatchGame
+from board import DEFAULT_BOARD
+
+# Actions, dans l'ordre de batch_engine: UP, DOWN, LEFT, RIGHT
+ACTIONS = [snake_basis.UP, snake_basis.DOWN, snake_basis.LEFT, snake_basis.RIGHT]
+
+BODY, HEAD, APPLE = 0, 1, 2
+
+REWARD_APPLE = 1.0
+REWARD_DEATH = -1.0
+
+
+class SnakeEnv:
+    """One game of ``snake_basis`` driven step by step.
+
+    After ``done``, call ``reset`` before stepping again.
+    """
+
+    n_actions = len(ACTIONS)
+
+    def __init__(self, board=DEFAULT_BOARD):
+        self.board = board
+        self.observation_shape = (3, board.height, board.width)
+        self.snake = None
+        self.apple = None
+
+    def reset(self, seed=None):
+        """Start a new game, drawn from ``random.Random(seed)``, and return its observation."""
+        self.snake = snake_basis.Snake(self.board, random.Random(seed))
+        self.apple = snake_basis.Apple(self.snake)
+        return self.observe()
+
+    def step(self, action):
+        snake = self.snake
+        score = snake.score
+        snake.turn(ACTIONS[action])
+        # snake_basis remet le serpent à zéro quand il meurt: la partie s'arrête là
+        died = snake.move(self.apple)
+        if died:
+            return self.observe(), REWARD_DEATH, True, {"score": score, "died": True}
+        snake_basis.check_eat(snake, self.apple)
+        reward = REWARD_APPLE if snake.score > score else 0.0
+        done = self.apple.complete
+        return self.observe(), reward, done, {"score": snake.score, "died": False}
+
+    def observe(self):
+        height = self.board.height
+        obs = np.zeros(self.observation_shape, dtype=np.uint8)
+        # Les cases sont numérotées colonne par colonne: x = case // hauteur, y = case % hauteur
+        cells = np.fromiter(self.snake.positions, dtype=np.int64, count=len(self.snake.positions))
+        obs[BODY, cells % height, cells // height] = 1
+        head = self.snake.positions[0]
+        obs[HEAD, head % height, head // height] = 1
+        if self.apple.position is not None:
+            obs[APPLE, self.apple.position % height, self.apple.position // height] = 1
+        return obs
+
+
+class VectorSnakeEnv:
+    """``n`` games of ``snake_basis`` stepped together.
+
+    Boards whose episode ends are reset in the same ``step``: their
+    observation is already the first one of the next episode, and
+    ``info["final_score"]`` holds the score they finished with. With
+    ``copy=False`` the observations are a buffer overwritten by the next
+    call, which saves a copy per step.
+    """
+
+    n_actions = len(ACTIONS)
+
+    def __init__(self, n, board=DEFAULT_BOARD, seed=None, copy=True):
+        self.n = n
+        self.board = board
+        self.copy = copy
+        self.game = BatchGame(n, board.width, board.height, wrap=True, seed=seed)
+        self.observation_shape = (3, board.height, board.width)
+        self.obs = np.zeros((n, 3, board.height, board.width), dtype=np.uint8)
+        self.rows = np.arange(n)
+
+    def reset(self, seed=None):
+        if seed is not None:
+            self.game.rng = np.random.default_rng(seed)
+        self.game.reset()
+        return self.observe()
+
+    def step(self, actions):
+        game = self.game
+        eaten, died = game.step(actions)
+        # Plateau rempli: plus de pomme, l'épisode est fini aussi
+        full = game.apple < 0
+        if full.any():
+            game.final_score[full] = game.score[full]
+            game.reset(full)
+        rewards = np.where(died, REWARD_DEATH, np.where(eaten, REWARD_APPLE, 0.0)).astype(np.float32)
+        dones = died | full
+        return self.observe(), rewards, dones, {"final_score": game.final_score.copy(), "died": died}
+
+    def observe(self):
+        game = self.game
+        obs = self.obs
+        n = self.n
+        # L'occupation de BatchGame est rangée ligne par ligne: le plan (hauteur, largeur) est une simple vue
+        obs[:, BODY] = game.boards()
+        # Ses cases sont numérotées comme celles du plateau: site les place dans le plan
+        planes = obs.reshape(n, 3, -1)
+        planes[:, HEAD] = 0
+        planes[self.rows, HEAD, game.site[game.head]] = 1
+        planes[:, APPLE] = 0
+        has_apple = game.apple >= 0
+        planes[self.rows[has_apple], APPLE, game.site[game.apple[has_apple]]] = 1
+        return obs.copy() if self.copy else obs
@@ -0,0 +1,229 @@
+"""Headless game runner.
+
+Plays the A*, Hamiltonian (with or without shortcuts) and Fusion snakes without opening a window and
+without ``clock.tick``, so a game runs as fast as the CPU allows. Rendering is
+an optional observer called after every tick, which draws the latest state at
+a fixed frame rate without slowing the game down.
+
+    python headless.py a_star --games 100 --max-steps 5000
+"""
+import argparse
+import os
+import random
+import time
+
+import a_star
+import live
+import snake as hamiltonian
+import snakeFusion as fusion
+from board import DEFAULT_BOARD, Board
+from profiling import Profiler
+from replay import ReplayRecorder
+
+
+class AStarGame:
+    name = "a_star"
+
+    def __init__(self, board=DEFAULT_BOARD, rng=random):
+        self.snake = a_star.Snake(board, rng)
+        self.apple = a_star.Apple(self.snake)
+
+    def tick(self):
+        return a_star.tick(self.snake, self.apple)
+
+
+class HamiltonianGame:
+    name = "hamiltonian"
+
+    def __init__(self, board=DEFAULT_BOARD, rng=random):
+        self.snake = hamiltonian.Snake(board, rng)
+        self.apple = hamiltonian.Apple(self.snake)
+
+    def tick(self):
+        return hamiltonian.tick(self.snake, self.apple)
+
+
+class ShortcutGame(HamiltonianGame):
+    name = "shortcut"
+
+    def __init__(self, board=DEFAULT_BOARD, rng=random):
+        self.snake = hamiltonian.ShortcutSnake(board, rng)
+        self.apple = hamiltonian.Apple(self.snake)
+
+
+class FusionGame:
+    name = "fusion"
+
+    def __init__(self, board=DEFAULT_BOARD, rng=random):
+        self.snake = fusion.Snake(board, rng)
+        self.apple = fusion.Apple(self.snake)
+        fusion.update_path(self.snake, self.apple)
+
+    def tick(self):
+        return fusion.tick(self.snake, self.apple)
+
+
+STRATEGIES = {game.name: game for game in (AStarGame, HamiltonianGame, ShortcutGame, FusionGame)}
+
+
+class PygameRenderer:
+    """Observer drawing the game in a pygame window ``fps`` times per second.
+
+    The game is not slowed down to the frame rate: ticks run unthrottled, or
+    ``tick_rate`` times per second if given, and the window shows the latest
+    state whenever a frame is due (see ``live.FramePacer``).
+    """
+
+    def __init__(self, fps=live.TURBO_FPS, board=DEFAULT_BOARD, tick_rate=None):
+        import pygame
+
+        self.pygame = pygame
+        self.pacer = live.FramePacer(tick_rate, fps)
+        from render import DirtyRenderer
+
+        pygame.init()
+        pygame.font.init()
+        self.screen = pygame.display.set_mode((board.screen_width, board.screen_height))
+        self.renderer = DirtyRenderer(self.screen, board)
+
+    def __call__(self, game, steps):
+        pygame = self.pygame
+        pacer = self.pacer
+        now = pacer.clock()
+        if not pacer.tick_due(now):
+            time.sleep(pacer.next_tick - now)
+            now = pacer.clock()
+        pacer.ticked(now)
+        if not pacer.frame_due(now):
+            return
+        # Seules les cases changées depuis l'image précédente sont redessinées
+        self.renderer.render(game.snake, game.apple, ["Score {0}".format(game.snake.score), "Steps {0}".format(steps)])
+        pacer.drawn(pacer.clock())
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return False
+
+
+def run_game(
+    strategy, max_steps=10000, observers=(), seed=None, board=DEFAULT_BOARD, profiler=None, recorder=None,
+    deadline=None, budget=None,
+):
+    """Play one game on ``board`` until the snake dies, fills the board or
+    ``max_steps`` ticks have run.
+
+    Each observer is called as ``observer(game, steps)`` after every tick; an
+    observer returning ``False`` stops the game. The game draws from its own
+    ``random.Random(seed)``; without a ``seed`` one is drawn, and returned in
+    the result, so that every game can be played again. A
+    ``profiling.Profiler`` given as ``profiler`` records the ticks of the A*
+    and Fusion snakes, and a ``replay.ReplayRecorder`` given as ``recorder``
+    logs the game. ``deadline`` limits the planning time of the A* snake to
+    that many seconds per tick, and ``budget`` to that many expanded cells;
+    the result counts the ticks that ran out. Only the budget gives the same
+    game on every run.
+    """
+    if seed is None:
+        seed = random.getrandbits(63)
+    game = STRATEGIES[strategy](board, random.Random(seed))
+    game.snake.profiler = profiler
+    if deadline is not None:
+        game.snake.deadline = deadline
+    if budget is not None:
+        game.snake.budget = budget
+    if recorder is not None:
+        recorder.start(strategy, seed, board, game, budget)
+    start = time.perf_counter()
+    steps = 0
+    died = False
+    score = game.snake.score
+    while steps < max_steps:
+        # Le score est lu avant le pas: les serpents remettent leur score à zéro en mourant.
+        score = game.snake.score
+        died = game.tick()
+        steps += 1
+        if died:
+            break
+        score = game.snake.score
+        if recorder is not None:
+            recorder.record(game)
+        if any(observer(game, steps) is False for observer in observers):
+            break
+        if game.apple.complete:
+            break
+
+    if recorder is not None:
+        recorder.finish(died)
+
+    return {
+        "strategy": strategy,
+        "board": [board.width, board.height],
+        "seed": seed,
+        "score": score,
+        "steps": steps,
+        "died": died,
+        "complete": game.apple.complete,
+        "time": time.perf_counter() - start,
+        "deadline_hits": getattr(game.snake, "deadline_hits", 0),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play snake games without a display.")
+    parser.add_argument("strategy", choices=sorted(STRATEGIES))
+    parser.add_argument("--games", type=int, default=1)
+    parser.add_argument("--max-steps", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=None, help="seed of the first game, the next ones follow")
+    parser.add_argument("--width", type=int, default=DEFAULT_BOARD.width, help="board width in cells")
+    parser.add_argument("--height", type=int, default=DEFAULT_BOARD.height, help="board height in cells")
+    parser.add_argument("--cell-size", type=int, default=DEFAULT_BOARD.cell_size, help="rendered cell size in pixels")
+    parser.add_argument("--render", action="store_true", help="show the games in a pygame window")
+    parser.add_argument("--record", default=None, help="write a replay of every game to this directory")
+    parser.add_argument(
+        "--profile", default=None, help="record the ticks of the planner to this .csv or .json file (a_star, fusion)"
+    )
+    parser.add_argument(
+        "--deadline", type=float, default=None, help="planning time per tick in milliseconds (a_star)"
+    )
+    parser.add_argument(
+        "--budget", type=int, default=None, help="cells the planner may expand per tick, reproducibly (a_star)"
+    )
+    parser.add_argument("--fps", type=int, default=live.TURBO_FPS, help="rendered frames per second")
+    parser.add_argument(
+        "--tick-rate", type=int, default=None, help="ticks per second when rendering (default: as fast as possible)"
+    )
+    args = parser.parse_args()
+    if args.record and args.deadline is not None:
+        # Les coups dépendraient de l'horloge: la graine ne suffirait plus à rejouer la partie
+        parser.error("--deadline games cannot be replayed, use --budget with --record")
+    board = Board(args.width, args.height, args.cell_size)
+
+    observers = []
+    if args.render:
+        observers.append(PygameRenderer(args.fps, board, args.tick_rate))
+
+    profiler = Profiler() if args.profile else None
+    deadline = None if args.deadline is None else args.deadline / 1000.0
+
+    for i in range(args.games):
+        seed = None if args.seed is None else args.seed + i
+        recorder = ReplayRecorder() if args.record else None
+        result = run_game(
+            args.strategy, args.max_steps, observers, seed, board, profiler, recorder, deadline, args.budget
+        )
+        if recorder is not None:
+            recorder.save(os.path.join(args.record, "{0}-{1}.snkr".format(args.strategy, result["seed"])))
+        line = "game {0}: seed {1} score {2} steps {3} died {4} complete {5} ({6:.2f}s)".format(
+            i, result["seed"], result["score"], result["steps"], result["died"], result["complete"], result["time"]
+        )
+        if deadline is not None or args.budget is not None:
+            line += " deadline hits {0}".format(result["deadline_hits"])
+        print(line)
+
+    if profiler is not None:
+        profiler.save(args.profile)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""Simulation and rendering on separate clocks.
+
+The game loops used to simulate, draw and ``clock.tick`` once per iteration,
+so the simulation could not run faster than the frame rate, and a slow
+planning tick delayed the next frame. Here the simulation advances at its own
+``tick_rate`` and the renderer samples the latest state ``fps`` times per
+second. Frames that come due while a tick is still running are skipped
+rather than queued, and a simulation that falls behind drops its backlog
+instead of trying to catch up.
+
+With ``tick_rate=None`` ("turbo") the simulation runs unthrottled and only
+stops to draw a frame when one is due.
+
+Everything runs on the calling thread: pygame wants its events on the main
+thread, and the planners are pure Python, so a second thread would only
+take turns with the first one.
+"""
+import time
+
+# Turbo: simulation sans limite, affichage rafraîchi 30 fois par seconde
+TURBO_FPS = 30
+
+
+class FramePacer:
+    """Tells when the next tick and the next frame are due.
+
+    ``ticks``, ``frames`` and ``skipped`` count the ticks run, the frames
+    drawn and the frames skipped because the loop was busy when they came
+    due.
+    """
+
+    def __init__(self, tick_rate=None, fps=TURBO_FPS, max_lag=0.25, clock=time.perf_counter):
+        self.tick_interval = 1.0 / tick_rate if tick_rate else 0.0
+        self.frame_interval = 1.0 / fps
+        self.max_lag = max_lag
+        self.clock = clock
+        now = clock()
+        self.next_tick = now
+        self.next_frame = now
+        self.ticks = 0
+        self.frames = 0
+        self.skipped = 0
+
+    @property
+    def turbo(self):
+        return not self.tick_interval
+
+    def tick_due(self, now):
+        return self.turbo or now >= self.next_tick
+
+    def ticked(self, now):
+        self.ticks += 1
+        if self.turbo:
+            return
+        self.next_tick += self.tick_interval
+        # Trop de retard: abandonner les ticks en souffrance plutôt que d'enchaîner pour rattraper
+        if now - self.next_tick > self.max_lag:
+            self.next_tick = now
+
+    def frame_due(self, now):
+        return now >= self.next_frame
+
+    def drawn(self, now):
+        self.frames += 1
+        # Les images échues pendant un tick trop long sont sautées, pas rattrapées
+        missed = int((now - self.next_frame) / self.frame_interval)
+        self.skipped += missed
+        self.next_frame += (missed + 1) * self.frame_interval
+
+    def wait(self, now):
+        # Temps à dormir avant le prochain tick ou la prochaine image
+        return max(0.0, min(self.next_tick, self.next_frame) - now)
+
+
+def run(step, draw, tick_rate=None, fps=TURBO_FPS, max_ticks=None):
+    """Call ``step()`` ``tick_rate`` times per second (as often as possible if
+    ``None``) and ``draw()`` ``fps`` times per second, until ``draw`` returns
+    ``False`` or ``max_ticks`` ticks have run. Returns the ``FramePacer``.
+    """
+    pacer = FramePacer(tick_rate, fps)
+    clock = pacer.clock
+    while max_ticks is None or pacer.ticks < max_ticks:
+        now = clock()
+        if pacer.frame_due(now):
+            if draw() is False:
+                break
+            pacer.drawn(clock())
+        elif pacer.tick_due(now):
+            step()
+            pacer.ticked(now)
+        else:
+            time.sleep(pacer.wait(now))
+    return pacer
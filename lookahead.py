@@ -0,0 +1,65 @@
+"""Zobrist hashing and a bounded transposition table for the lookaheads.
+
+A set of cells is hashed as the XOR of one random 64-bit key per cell, so
+adding or removing a cell updates the hash with a single XOR and the search
+never has to rehash, or copy, the body it is exploring.
+"""
+import random
+from collections import OrderedDict
+
+
+class ZobristKeys:
+    """Random 64-bit key per cell, drawn the first time the cell is seen.
+
+    ``cells`` are drawn up front, in order; on big boards leaving it empty
+    keeps only the keys of the cells a search actually reaches.
+    """
+
+    def __init__(self, cells=(), seed=0):
+        # Générateur à part: ne pas consommer le random global dont dépendent les parties
+        self.rng = random.Random(seed)
+        self.keys = {}
+        for cell in cells:
+            self.keys[cell] = self.rng.getrandbits(64)
+
+    def __getitem__(self, cell):
+        key = self.keys.get(cell)
+        if key is None:
+            key = self.keys[cell] = self.rng.getrandbits(64)
+        return key
+
+    def hash(self, cells):
+        key = 0
+        for cell in cells:
+            key ^= self[cell]
+        return key
+
+
+class TranspositionTable:
+    """Results by state key, evicting the least recently used beyond ``capacity``."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,356 @@
+"""A* on the snake grid without per-call allocation.
+
+Cells are numbered column by column (``x * height + y``), so comparing two
+cell numbers orders them like the ``(x, y)`` tuples ``a_star.a_star_search``
+used to push on its heap: ties are broken the same way and the paths found
+are identical. Grids are flat lists indexed by cell number, truthy on the
+blocked cells, and paths are lists of cell numbers.
+
+The scores live in flat lists allocated once and reused by every search; a
+generation counter tells which entries belong to the current search, so
+nothing is cleared between calls. Every step costs 1, so the open set is a
+bucket queue indexed by the f-score, each bucket being a small heap of cell
+numbers.
+
+``longest_path`` builds a long path between two cells under a time or node
+budget, for the snake to stall while following its tail.
+
+``IncrementalSearch`` is a D* Lite planner for the snake: it searches from
+the apple back to the head and keeps its search tree between ticks, so that
+moving the head and freeing the tail only repairs the part of the tree those
+cells affect.
+"""
+import time
+from collections import deque
+from functools import lru_cache
+from heapq import heappop, heappush
+
+# DOWN, RIGHT, UP, LEFT: the order a_star_search expanded the neighbors in
+DIRECTIONS = [(0, 1), (1, 0), (0, -1), (-1, 0)]
+
+
+INF = float("inf")
+
+
+@lru_cache(maxsize=8)
+def grid_neighbors(width, height):
+    # neighbors[cell]: tuples (voisin, x, y) des cases voisines dans le plateau, dans l'ordre
+    # de DIRECTIONS. Table partagée par toutes les recherches sur un plateau de cette taille:
+    # un seul triplet par case, référencé par ses voisines, pour tenir en mémoire à 1000x1000.
+    points = [(x * height + y, x, y) for x in range(width) for y in range(height)]
+    neighbors = []
+    for cell, x, y in points:
+        entry = []
+        if y + 1 < height:
+            entry.append(points[cell + 1])
+        if x + 1 < width:
+            entry.append(points[cell + height])
+        if y > 0:
+            entry.append(points[cell - 1])
+        if x > 0:
+            entry.append(points[cell - height])
+        neighbors.append(tuple(entry))
+    return neighbors
+
+
+class GridSearch:
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        cells = width * height
+        self.neighbors = grid_neighbors(width, height)
+        self.gscore = [0] * cells
+        self.came_from = [0] * cells
+        self.seen = [0] * cells  # generation where gscore was last set
+        self.closed = [0] * cells  # generation where the cell was last expanded
+        self.generation = 0
+        self.expansions = 0
+        # Une file par valeur de f, ajoutées à mesure que des f plus grands apparaissent
+        self.buckets = [[] for _ in range(width + height)]
+
+    def search(self, grid, start, goal):
+        """Shortest path from the cell ``start`` to ``goal``, start excluded, or ``[]``."""
+        self.generation += 1
+        generation = self.generation
+        height = self.height
+        neighbors = self.neighbors
+        gscore = self.gscore
+        came_from = self.came_from
+        seen = self.seen
+        closed = self.closed
+        buckets = self.buckets
+        goal_x, goal_y = divmod(goal, height)
+        target = goal
+
+        source = start
+        start_x, start_y = divmod(start, height)
+        seen[source] = generation
+        gscore[source] = 0
+        f = abs(start_x - goal_x) + abs(start_y - goal_y)
+        top = f
+        buckets[f].append(source)
+
+        while f <= top:
+            bucket = buckets[f]
+            if not bucket:
+                f += 1
+                continue
+            current = heappop(bucket)
+            if closed[current] == generation:
+                continue  # entrée périmée, la case a déjà été développée
+            if current == target:
+                for i in range(f, top + 1):
+                    buckets[i].clear()
+                path = []
+                while current != source:
+                    path.append(current)
+                    current = came_from[current]
+                return path[::-1]
+
+            closed[current] = generation
+            self.expansions += 1
+            tentative_g_score = gscore[current] + 1  # Every step has a cost of 1
+            for neighbor, x, y in neighbors[current]:
+                if grid[neighbor] or closed[neighbor] == generation:
+                    continue
+                if seen[neighbor] != generation or tentative_g_score < gscore[neighbor]:
+                    seen[neighbor] = generation
+                    gscore[neighbor] = tentative_g_score
+                    came_from[neighbor] = current
+                    fscore = tentative_g_score + abs(x - goal_x) + abs(y - goal_y)
+                    if fscore > top:
+                        top = fscore
+                        while len(buckets) <= top:
+                            buckets.append([])
+                    heappush(buckets[fscore], neighbor)
+
+        return []  # If no path is found
+
+
+def longest_path(is_free, start, goal, width, height, time_budget=None, node_budget=None):
+    """Long path from the cell ``start`` to ``goal``, both included, or ``[]``.
+
+    Starts from a shortest path and lengthens it with detours: two adjacent
+    steps ``a -> b`` become ``a -> c -> d -> b`` when ``c`` and ``d`` are the
+    free cells beside them. ``is_free(cell)`` tells which cells may be used
+    (``goal`` must be one of them). When ``time_budget`` seconds or
+    ``node_budget`` expanded cells are spent, the best path so far is
+    returned.
+    """
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    nodes = 0
+    neighbors = grid_neighbors(width, height)
+
+    def exhausted():
+        return (node_budget is not None and nodes >= node_budget) or (
+            deadline is not None and time.perf_counter() >= deadline
+        )
+
+    # Plus court chemin par un parcours en largeur
+    came_from = {start: None}
+    queue = deque([start])
+    while queue and goal not in came_from:
+        if exhausted():
+            return []
+        current = queue.popleft()
+        nodes += 1
+        for neighbor, _, _ in neighbors[current]:
+            if neighbor not in came_from and is_free(neighbor):
+                came_from[neighbor] = current
+                queue.append(neighbor)
+    if goal not in came_from:
+        return []
+
+    # Chemin chaîné par next_cell pour insérer les détours en O(1)
+    next_cell = {goal: None}
+    current = goal
+    while current != start:
+        previous = came_from[current]
+        next_cell[previous] = current
+        current = previous
+
+    # Un seul passage suffit: les cases libres ne font que diminuer,
+    # un détour refusé plus tôt le reste
+    current = start
+    while next_cell[current] is not None and not exhausted():
+        following = next_cell[current]
+        nodes += 1
+        x, y = divmod(current, height)
+        fx, fy = divmod(following, height)
+        dx, dy = fx - x, fy - y
+        for px, py in ((dy, dx), (-dy, -dx)):  # les deux côtés du pas
+            if not (0 <= x + px < width and 0 <= y + py < height and 0 <= fx + px < width and 0 <= fy + py < height):
+                continue
+            c = (x + px) * height + y + py
+            d = (fx + px) * height + fy + py
+            if c not in next_cell and d not in next_cell and is_free(c) and is_free(d):
+                next_cell[current] = c
+                next_cell[c] = d
+                next_cell[d] = following
+                break
+        else:
+            current = following
+
+    path = [start]
+    while next_cell[path[-1]] is not None:
+        path.append(next_cell[path[-1]])
+    return path
+
+
+class IncrementalSearch:
+    """D* Lite from the goal back to the start, repaired between calls.
+
+    ``plan`` must be told which cells changed since the previous call; moving
+    the start is tracked on its own. A new goal (the apple respawned) restarts
+    the search from scratch. ``expansions`` counts the cells expanded so far.
+
+    A search stopped by its deadline or its expansion limit keeps its queue:
+    the next call resumes it where it stopped.
+    """
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.cells = width * height
+        self.neighbors = grid_neighbors(width, height)
+        self.expansions = 0
+        self.interrupted = False  # le dernier appel à plan a atteint son échéance
+        self.reset()
+
+    def reset(self):
+        # Oublie l'arbre de recherche: le prochain appel à plan repart de zéro
+        self.goal = None
+        self.start = None
+
+    def plan(self, grid, start, goal, changed=(), deadline=None, limit=None):
+        """Shortest path from the cell ``start`` to ``goal``, start excluded, or ``[]``.
+
+        The start is always traversable, even if ``grid`` blocks it (it holds
+        the head). ``changed`` lists the cells whose blocked state changed
+        since the previous call. When ``time.perf_counter()`` reaches
+        ``deadline``, or ``expansions`` reaches ``limit``, the search stops,
+        ``interrupted`` is set and ``[]`` is returned. Unlike the deadline,
+        the limit gives the same result on every run.
+        """
+        if goal != self.goal:
+            self.initialize(start, goal)
+        else:
+            cells = list(changed)
+            if start != self.start:
+                self.km += self.distance(self.start, start)
+                # L'ancienne tête devient un obstacle, la nouvelle reste traversable
+                cells.append(self.start)
+                cells.append(start)
+                self.start = start
+            for cell in cells:
+                self.update_vertex(grid, cell)
+                for neighbor, _, _ in self.neighbors[cell]:
+                    self.update_vertex(grid, neighbor)
+        self.interrupted = not self.compute_shortest_path(grid, deadline, limit)
+        if self.interrupted:
+            return []
+        return self.extract_path(grid)
+
+    def initialize(self, start, goal):
+        self.start = start
+        self.goal = goal
+        self.km = 0
+        self.g = [INF] * self.cells
+        self.rhs = [INF] * self.cells
+        self.queued = [-1] * self.cells  # clé de la case dans la file, -1 si absente
+        self.queue = []
+        self.rhs[goal] = 0
+        self.push(goal)
+
+    def distance(self, a, b):
+        height = self.height
+        return abs(a // height - b // height) + abs(a % height - b % height)
+
+    def key(self, cell):
+        # Clé (k1, k2) de D* Lite encodée en un seul entier k1 * (cases + 1) + k2
+        m = min(self.g[cell], self.rhs[cell])
+        return (m + self.distance(self.start, cell) + self.km) * (self.cells + 1) + m
+
+    def push(self, cell):
+        key = self.key(cell)
+        self.queued[cell] = key
+        heappush(self.queue, key * self.cells + cell)
+
+    def top(self):
+        # Plus petite entrée à jour de la file, en jetant les entrées périmées
+        queue = self.queue
+        while queue:
+            key, cell = divmod(queue[0], self.cells)
+            if self.queued[cell] == key:
+                return key, cell
+            heappop(queue)
+        return None
+
+    def update_vertex(self, grid, cell):
+        if cell != self.goal:
+            best = INF
+            start = self.start
+            if cell == start or not grid[cell]:
+                g = self.g
+                for neighbor, _, _ in self.neighbors[cell]:
+                    if g[neighbor] < best and (neighbor == start or not grid[neighbor]):
+                        best = g[neighbor]
+                best += 1
+            self.rhs[cell] = best
+        if self.g[cell] != self.rhs[cell]:
+            self.push(cell)
+        else:
+            self.queued[cell] = -1
+
+    def compute_shortest_path(self, grid, deadline=None, limit=None):
+        # Renvoie False si la limite d'expansions ou l'échéance, regardée toutes les 64 expansions,
+        # arrive avant la fin: chaque appel avance d'au moins une expansion, la recherche reprise finit toujours
+        g = self.g
+        rhs = self.rhs
+        start = self.start
+        while True:
+            top = self.top()
+            if top is None:
+                return True
+            key, cell = top
+            if key >= self.key(start) and rhs[start] == g[start]:
+                return True
+            heappop(self.queue)
+            self.queued[cell] = -1
+            self.expansions += 1
+            new_key = self.key(cell)
+            if key < new_key:
+                self.push(cell)
+            elif g[cell] > rhs[cell]:
+                g[cell] = rhs[cell]
+                for neighbor, _, _ in self.neighbors[cell]:
+                    self.update_vertex(grid, neighbor)
+            else:
+                g[cell] = INF
+                self.update_vertex(grid, cell)
+                for neighbor, _, _ in self.neighbors[cell]:
+                    self.update_vertex(grid, neighbor)
+            if limit is not None and self.expansions >= limit:
+                return False
+            if deadline is not None and not self.expansions & 63 and time.perf_counter() >= deadline:
+                return False
+
+    def extract_path(self, grid):
+        # Descente de gradient sur g depuis le départ, dans l'ordre DOWN, RIGHT, UP, LEFT
+        g = self.g
+        current = self.start
+        if g[current] == INF:
+            return []
+        path = []
+        while current != self.goal:
+            best = None
+            best_g = g[current]
+            for neighbor, _, _ in self.neighbors[current]:
+                if g[neighbor] < best_g and not grid[neighbor]:
+                    best = neighbor
+                    best_g = g[neighbor]
+            if best is None:
+                return []
+            path.append(best)
+            current = best
+        return path
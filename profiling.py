@@ -0,0 +1,95 @@
+"""Opt-in per-tick profiling of the planners.
+
+A ``Profiler`` attached to a snake (``snake.profiler = Profiler()``) records
+one row per tick: the wall time of each planning phase and counters such as
+the cells expanded by the searches. Rows go to a ring buffer holding the
+last ``capacity`` ticks and can be written out as CSV or JSON.
+
+A snake without a profiler (the default) only pays for one test of
+``snake.profiler`` per phase.
+
+Phases, in seconds: ``grid`` (grid and connectivity updates), ``search``
+(path searches), ``safety`` (safety checks), ``temporize`` (looking for a
+way to stall), ``survival`` (Fusion's survival lookahead) and ``respawn``
+(apple respawns). Counters: ``expanded`` (cells expanded by the searches),
+``visited`` (cells visited by the flood fills), ``depth`` (deepest
+lookahead), ``replans``, ``unsafe``, ``collisions``, ``temporized``,
+``stuck`` and ``deadline`` (ticks whose planning ran out of time or of
+budget).
+"""
+import csv
+import json
+import time
+from collections import deque
+
+# Colonnes toujours présentes, avant les phases et compteurs rencontrés
+FIRST_COLUMNS = ["tick", "time", "died"]
+
+
+class Profiler:
+    def __init__(self, capacity=100000, clock=time.perf_counter):
+        self.records = deque(maxlen=capacity)
+        self.clock = clock
+        self.ticks = 0
+        self.row = None
+        self.start = 0.0
+
+    def begin(self):
+        self.row = {"tick": self.ticks}
+        self.start = self.clock()
+
+    def add(self, name, value=1):
+        # Somme sur le tick: temps d'une phase ou compteur
+        row = self.row
+        row[name] = row.get(name, 0) + value
+
+    def peak(self, name, value):
+        # Maximum sur le tick, pour les profondeurs
+        row = self.row
+        if value > row.get(name, 0):
+            row[name] = value
+
+    def end(self, died=False):
+        row = self.row
+        row["time"] = self.clock() - self.start
+        row["died"] = int(died)
+        self.records.append(row)
+        self.ticks += 1
+        self.row = None
+
+    def columns(self):
+        seen = {name for row in self.records for name in row}
+        return FIRST_COLUMNS + sorted(seen - set(FIRST_COLUMNS))
+
+    def rows(self):
+        """The recorded ticks, oldest first, each with every column (0 when absent)."""
+        columns = self.columns()
+        return [{name: row.get(name, 0) for name in columns} for row in self.records]
+
+    def totals(self):
+        totals = {}
+        for row in self.records:
+            for name, value in row.items():
+                if name != "tick":
+                    totals[name] = totals.get(name, 0) + value
+        return totals
+
+    def to_csv(self, path):
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, self.columns())
+            writer.writeheader()
+            writer.writerows(self.rows())
+
+    def to_json(self, path):
+        with open(path, "w") as f:
+            json.dump(self.rows(), f)
+
+    def save(self, path):
+        # Format choisi d'après l'extension: .csv, sinon JSON
+        if path.endswith(".csv"):
+            self.to_csv(path)
+        else:
+            self.to_json(path)
+
+    def clear(self):
+        self.records.clear()
@@ -0,0 +1,135 @@
+"""Dirty-rectangle rendering of a game.
+
+Instead of clearing and redrawing the whole board every frame,
+``DirtyRenderer`` remembers how it drew each cell and only repaints the cells
+whose look changed since the previous frame: the new head, the vacated tail,
+the apple, the cells the path gained or lost. Only their rectangles are then
+handed to ``pygame.display.update``. The empty board is drawn once into a
+cached background that vacated cells are restored from.
+
+Snakes describe what to draw with ``layers()``: a list of
+``(cells, color, outlined)``, bottom layer first.
+
+``ArrayRenderer`` draws a board buffer instead, one palette index per cell
+(the a_star grid), through ``pygame.surfarray``.
+"""
+import pygame
+
+BLACK = (0, 0, 0)
+WHITE = (255, 255, 255)
+
+
+def fill_background(surface, board):
+    surface.fill(BLACK)
+
+
+def frame_cells(snake, apple):
+    # Aspect de chaque case à dessiner, {case: (couleur, bordure)}: une couche recouvre les précédentes
+    cells = {}
+    for layer, color, outlined in snake.layers():
+        look = (color, outlined)
+        for cell in layer:
+            cells[cell] = look
+    if apple.position is not None:
+        cells[apple.position] = (apple.color, True)
+    return cells
+
+
+class DirtyRenderer:
+    """Draws a snake and its apple on ``screen``, pushing only the changed cells.
+
+    ``background(surface, board)`` draws the empty board, a plain black fill
+    by default. The text lines of ``render`` are written in the top left
+    corner, whose cells are repainted every frame.
+    """
+
+    def __init__(self, screen, board, background=fill_background, font=None, hud_size=(160, 50)):
+        self.screen = screen
+        self.board = board
+        self.background = pygame.Surface(screen.get_size()).convert()
+        background(self.background, board)
+        self.font = font or pygame.font.SysFont("monospace", 16)
+        # Cases recouvertes par le texte, et le rectangle qui les contient
+        size = board.cell_size
+        columns = min(board.width, -(-hud_size[0] // size))
+        rows = min(board.height, -(-hud_size[1] // size))
+        self.hud_cells = [board.cell(x, y) for x in range(columns) for y in range(rows)]
+        self.hud_rect = pygame.Rect(0, 0, columns * size, rows * size)
+        self.drawn = {}
+        self.full = True
+
+    def invalidate(self):
+        # Tout redessiner à la prochaine image (fenêtre recouverte, nouvelle partie...)
+        self.full = True
+
+    def paint(self, cell, look):
+        size = self.board.cell_size
+        r = pygame.Rect(self.board.to_pixels(cell), (size, size))
+        self.screen.blit(self.background, r, r)
+        if look is not None:
+            pygame.draw.rect(self.screen, look[0], r)
+            if look[1]:
+                pygame.draw.rect(self.screen, BLACK, r, 1)
+        return r
+
+    def render(self, snake, apple, lines=()):
+        """Draw the frame and return the rectangles pushed to the display."""
+        cells = frame_cells(snake, apple)
+        if self.full:
+            self.full = False
+            self.screen.blit(self.background, (0, 0))
+            for cell, look in cells.items():
+                self.paint(cell, look)
+            rects = [self.screen.get_rect()]
+        else:
+            # Cases apparues, disparues ou qui ont changé d'aspect
+            changed = {cell for cell, _ in cells.items() ^ self.drawn.items()}
+            changed.difference_update(self.hud_cells)
+            rects = [self.paint(cell, cells.get(cell)) for cell in changed]
+            for cell in self.hud_cells:
+                self.paint(cell, cells.get(cell))
+            rects.append(self.hud_rect)
+        self.drawn = cells
+
+        for i, line in enumerate(lines):
+            text = self.font.render(line, 1, WHITE)
+            self.screen.blit(text, (5, 10 + 20 * i))
+        pygame.display.update(rects)
+        return rects
+
+
+class ArrayRenderer:
+    """Draws a per-cell byte buffer on ``screen`` through ``pygame.surfarray``.
+
+    ``render`` takes the buffer as a ``(width, height)`` view (see
+    ``Board.view``) whose bytes are indices into ``palette``: a frame is one
+    copy of the buffer into an 8-bit surface of one pixel per cell, scaled to
+    the screen, however long the snake. The cells the buffer does not hold are
+    drawn over it as overlays, a list of ``(cells, color)`` whose colors must
+    be in ``palette``. Cells have no outline.
+    """
+
+    def __init__(self, screen, board, palette, font=None):
+        self.screen = screen
+        self.board = board
+        self.cells = pygame.Surface((board.width, board.height), depth=8)
+        self.cells.set_palette(palette)
+        # Mise à l'échelle dans une surface de même format, puis conversion vers l'écran
+        self.scaled = pygame.Surface(screen.get_size(), depth=8)
+        self.scaled.set_palette(palette)
+        self.font = font or pygame.font.SysFont("monospace", 16)
+
+    def render(self, view, overlays=(), lines=()):
+        cells = self.cells
+        pygame.surfarray.blit_array(cells, view)
+        xy = self.board.xy
+        for layer, color in overlays:
+            for cell in layer:
+                cells.set_at(xy(cell), color)
+        pygame.transform.scale(cells, self.scaled.get_size(), self.scaled)
+        self.screen.blit(self.scaled, (0, 0))
+
+        for i, line in enumerate(lines):
+            text = self.font.render(line, 1, WHITE)
+            self.screen.blit(text, (5, 10 + 20 * i))
+        pygame.display.update()
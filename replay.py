@@ -0,0 +1,401 @@
+"""Compact binary replays of seeded games.
+
+Every headless game draws from its own ``random.Random(seed)``, so the seed
+alone replays it. A replay log also stores what the game did, so that it can
+be checked against a new run and rebuilt tick by tick without running the
+planner again:
+
+- a header: the strategy, the board size, the seed, the number of ticks,
+  and the planning budget of the A* snake (cells expanded per tick, 0 for
+  none), since it changes the moves;
+- one 2-bit code per tick, the direction the head moved (UP, DOWN, LEFT,
+  RIGHT, in the order of the game modules), four ticks per byte;
+- the cell of every apple, the first one and one per apple eaten;
+- the runs of ticks where the head did not move (Fusion planning a move
+  without making it), as (first tick, count) pairs; their code is 0;
+- a keyframe every ``KEYFRAME_INTERVAL`` ticks, written while recording: the
+  body, the length, the apples eaten and the next run of still ticks, so
+  that reaching any tick replays at most one interval of moves.
+
+A 50 000-tick game takes about 12.5 KB plus 4 bytes per apple for the moves,
+and 24 bytes plus 4 per body cell for each of its 49 keyframes. The tick
+that kills the snake is not logged: ``died`` tells that the next one was
+fatal.
+
+    python headless.py a_star --seed 7 --record replays/
+    python replay.py info replays/a_star-7.snkr
+    python replay.py check replays/a_star-7.snkr
+    python replay.py state replays/a_star-7.snkr --tick 1200
+"""
+import argparse
+import mmap
+import random
+import struct
+import sys
+from array import array
+
+from board import Board
+from body import Body
+
+MAGIC = b"SNKR"
+VERSION = 3
+# magic, version, stratégie, largeur, hauteur, graine, ticks, pommes, séries de ticks immobiles, mort, budget,
+# intervalle et nombre des images clés
+HEADER = struct.Struct("<4sB16sHHqIIIBIII")
+# Versions 1 (sans budget) et 2 (sans images clés): toujours lisibles
+HEADER_V1 = struct.Struct("<4sB16sHHqIIIB")
+HEADER_V2 = struct.Struct("<4sB16sHHqIIIBI")
+
+# Ticks entre deux images clés
+KEYFRAME_INTERVAL = 1024
+
+# Codes des déplacements de la tête: UP, DOWN, LEFT, RIGHT
+DIRECTIONS = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+
+# Pomme « absente »: le serpent a rempli le plateau
+NO_APPLE = 0xFFFFFFFF
+
+
+def move_code(board, before, after):
+    """Code of the move from ``before`` to ``after``, on a walled or wrapping board, or ``None``."""
+    for code, direction in enumerate(DIRECTIONS):
+        if board.neighbor(before, direction) == after or board.wrap(before, direction) == after:
+            return code
+    return None
+
+
+def follow(board, cell, code):
+    # Case atteinte depuis cell par le déplacement code, en repassant de l'autre côté sur un tore
+    direction = DIRECTIONS[code]
+    after = board.neighbor(cell, direction)
+    return after if after >= 0 else board.wrap(cell, direction)
+
+
+class ReplayRecorder:
+    """Logs a game as it is played: ``start`` before the first tick, ``record``
+    after every tick the snake survives, ``finish`` at the end.
+
+    A keyframe of the game is kept every ``interval`` ticks, tick 0 included.
+    """
+
+    def __init__(self, interval=KEYFRAME_INTERVAL):
+        self.moves = bytearray()
+        self.apples = array("I")
+        self.stays = array("I")
+        self.ticks = 0
+        self.died = False
+        self.interval = interval
+        # Images clés: début de chaque corps dans bodies, puis longueur, pommes mangées,
+        # prochaine série immobile et taille du corps, quatre entiers par image
+        self.offsets = array("Q")
+        self.keyframes = array("I")
+        self.bodies = array("I")
+
+    def start(self, strategy, seed, board, game, budget=None):
+        self.strategy = strategy
+        self.seed = seed
+        self.board = board
+        self.budget = budget
+        self.head = game.snake.positions[0]
+        self.apple = game.apple.position
+        self.apples.append(NO_APPLE if self.apple is None else self.apple)
+        self.keyframe(game)
+
+    def keyframe(self, game):
+        # Même image que ReplayState.snapshot après self.ticks ticks
+        body = game.snake.positions
+        eaten = len(self.apples) - 1
+        stays = self.stays
+        run = len(stays)
+        if stays and stays[-2] + stays[-1] >= self.ticks:
+            run -= 2  # la dernière série touche encore le tick courant
+        self.offsets.append(len(self.bodies))
+        self.keyframes.extend((3 + eaten, eaten, run, len(body)))
+        self.bodies.extend(body)
+
+    def record(self, game):
+        tick = self.ticks
+        head = game.snake.positions[0]
+        if tick % 4 == 0:
+            self.moves.append(0)
+        if head == self.head:
+            stays = self.stays
+            if stays and stays[-2] + stays[-1] == tick:
+                stays[-1] += 1  # la série en cours s'allonge
+            else:
+                stays.append(tick)
+                stays.append(1)
+        else:
+            code = move_code(self.board, self.head, head)
+            if code is None:
+                raise ValueError("tick {0}: the head jumped from cell {1} to {2}".format(tick, self.head, head))
+            self.moves[-1] |= code << (2 * (tick % 4))
+            self.head = head
+        apple = game.apple.position
+        if apple != self.apple:
+            self.apples.append(NO_APPLE if apple is None else apple)
+            self.apple = apple
+        self.ticks = tick + 1
+        if self.ticks % self.interval == 0:
+            self.keyframe(game)
+
+    def finish(self, died):
+        self.died = died
+
+    def to_bytes(self):
+        header = HEADER.pack(
+            MAGIC, VERSION, self.strategy.encode(), self.board.width, self.board.height,
+            self.seed, self.ticks, len(self.apples), len(self.stays) // 2, self.died, self.budget or 0,
+            self.interval, len(self.offsets),
+        )
+        tables = [self.apples, self.stays, self.offsets, self.keyframes, self.bodies]
+        if sys.byteorder == "big":
+            # Le fichier est little-endian, comme l'en-tête
+            tables = [array(table.typecode, table) for table in tables]
+            for table in tables:
+                table.byteswap()
+        return header + bytes(self.moves) + b"".join(table.tobytes() for table in tables)
+
+    def save(self, path):
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+
+
+class Replay:
+    """A replay log read from ``data`` (bytes, or any buffer such as an mmap)."""
+
+    def __init__(self, data):
+        magic, version = struct.unpack_from("<4sB", data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a snake replay")
+        interval = keyframes = 0
+        if version == VERSION:
+            header = HEADER
+            (_, _, strategy, width, height, seed, ticks, apples, stays, died, budget, interval, keyframes) = (
+                header.unpack_from(data, 0)
+            )
+        elif version == 2:
+            header = HEADER_V2
+            (_, _, strategy, width, height, seed, ticks, apples, stays, died, budget) = header.unpack_from(data, 0)
+        elif version == 1:
+            header = HEADER_V1
+            (_, _, strategy, width, height, seed, ticks, apples, stays, died) = header.unpack_from(data, 0)
+            budget = 0
+        else:
+            raise ValueError("unsupported replay version {0}".format(version))
+        self.strategy = strategy.rstrip(b"\0").decode()
+        self.board = Board(width, height)
+        self.seed = seed
+        self.ticks = ticks
+        self.died = bool(died)
+        self.budget = budget or None
+        self.interval = interval or None  # None: pas d'images clés dans le fichier
+        offset = header.size
+        self.moves = memoryview(data)[offset:offset + (ticks + 3) // 4]
+        offset += len(self.moves)
+        self.apples = self.table(data, offset, apples, "I")
+        offset += 4 * apples
+        self.stays = self.table(data, offset, 2 * stays, "I")
+        offset += 8 * stays
+        self.offsets = self.table(data, offset, keyframes, "Q")
+        offset += 8 * keyframes
+        self.keyframes = self.table(data, offset, 4 * keyframes, "I")
+        offset += 16 * keyframes
+        self.bodies = self.table(data, offset, (len(data) - offset) // 4, "I")
+
+    @staticmethod
+    def table(data, offset, count, typecode):
+        size = array(typecode).itemsize
+        view = memoryview(data)[offset:offset + size * count]
+        if sys.byteorder == "little":
+            return view.cast(typecode)  # lu en place, sans copie (un mmap reste sur le disque)
+        values = array(typecode)
+        values.frombytes(view)
+        values.byteswap()
+        return values
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    @classmethod
+    def open(cls, path):
+        """The replay at ``path``, memory-mapped instead of read: pages are loaded as they are used."""
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data)
+
+    def move(self, tick):
+        # Code du déplacement de la tête au tick donné (0 pour un tick immobile)
+        return (self.moves[tick >> 2] >> (2 * (tick & 3))) & 3
+
+    def keyframe(self, index):
+        """Snapshot of the state at tick ``index * interval``, as written while recording."""
+        length, eaten, run, size = self.keyframes[4 * index:4 * index + 4]
+        start = self.offsets[index]
+        return array("I", self.bodies[start:start + size]), length, eaten, run, index * self.interval
+
+    def states(self):
+        """Yield ``(tick, body, apple)`` from tick 0 to the last one, without the planner.
+
+        ``body`` is the same ``Body``, updated in place; ``apple`` is ``None``
+        once the board is full. See ``ReplayState``.
+        """
+        state = ReplayState(self)
+        yield 0, state.body, state.apple
+        while state.tick < self.ticks:
+            state.step()
+            yield state.tick, state.body, state.apple
+
+
+class ReplayState:
+    """Body and apple of a replay after ``tick`` ticks, rebuilt without the planner.
+
+    Every snake starts with one cell in the middle of the board and a length
+    of 3, drops its tail when it is longer than that, and grows by one for
+    every apple its head reaches.
+    """
+
+    def __init__(self, replay, cells=None, length=3, eaten=0, run=0, tick=0):
+        self.replay = replay
+        self.body = Body([replay.board.center] if cells is None else cells)
+        self.length = length
+        self.eaten = eaten  # pommes mangées, index de la pomme en jeu dans replay.apples
+        self.run = run  # index de la prochaine série de ticks immobiles dans replay.stays
+        self.tick = tick
+
+    @property
+    def apple(self):
+        apple = self.replay.apples[self.eaten]
+        return None if apple == NO_APPLE else apple
+
+    def step(self):
+        replay = self.replay
+        stays = replay.stays
+        tick = self.tick
+        run = self.run
+        if run < len(stays) and tick >= stays[run] + stays[run + 1]:
+            run = self.run = run + 2
+        if not (run < len(stays) and stays[run] <= tick):
+            body = self.body
+            head = follow(replay.board, body[0], replay.move(tick))
+            body.push_head(head)
+            if len(body) > self.length:
+                body.pop_tail()
+            if head == replay.apples[self.eaten]:
+                self.length += 1
+                self.eaten += 1
+        self.tick = tick + 1
+
+    def snapshot(self):
+        # Image compacte de l'état, pour ReplayIndex
+        return array("I", self.body), self.length, self.eaten, self.run, self.tick
+
+    @classmethod
+    def restore(cls, replay, snapshot):
+        return cls(replay, *snapshot)
+
+
+class ReplayIndex:
+    """Random access to the states of a replay.
+
+    A snapshot of the state is kept every ``interval`` ticks, so reaching a
+    tick replays at most ``interval`` moves from the snapshot before it, in
+    either direction. The keyframes of the file are used when ``interval``
+    is theirs (the default); otherwise, or for a file without keyframes,
+    snapshots are taken the first time playback goes past them.
+    """
+
+    def __init__(self, replay, interval=None):
+        self.replay = replay
+        self.interval = interval or replay.interval or KEYFRAME_INTERVAL
+        self.stored = self.interval == replay.interval
+        self.keyframes = [ReplayState(replay).snapshot()]
+
+    def state(self, tick):
+        """A new ``ReplayState`` at ``tick`` (clamped to the game)."""
+        tick = max(0, min(tick, self.replay.ticks))
+        keyframe = tick // self.interval
+        if self.stored:
+            snapshot = self.replay.keyframe(keyframe)
+        else:
+            while len(self.keyframes) <= keyframe:
+                state = ReplayState.restore(self.replay, self.keyframes[-1])
+                for _ in range(self.interval):
+                    state.step()
+                self.keyframes.append(state.snapshot())
+            snapshot = self.keyframes[keyframe]
+        state = ReplayState.restore(self.replay, snapshot)
+        while state.tick < tick:
+            state.step()
+        return state
+
+
+def replay_game(replay, until=None):
+    """Play the logged game again through its planner, up to tick ``until``, and return it."""
+    from headless import STRATEGIES
+
+    game = STRATEGIES[replay.strategy](replay.board, random.Random(replay.seed))
+    if replay.budget is not None:
+        game.snake.budget = replay.budget
+    for _ in range(replay.ticks if until is None else until):
+        game.tick()
+    return game
+
+
+def check(replay):
+    """Whether running the game again from its seed logs exactly the same replay."""
+    from headless import run_game
+
+    recorder = ReplayRecorder(replay.interval or KEYFRAME_INTERVAL)
+    run_game(
+        replay.strategy, replay.ticks + replay.died, seed=replay.seed, board=replay.board, recorder=recorder,
+        budget=replay.budget,
+    )
+    return (
+        recorder.ticks == replay.ticks
+        and recorder.died == replay.died
+        and bytes(recorder.moves) == bytes(replay.moves)
+        and recorder.apples == replay.apples
+        and recorder.stays == replay.stays
+        and (replay.interval is None or (
+            recorder.offsets == replay.offsets
+            and recorder.keyframes == replay.keyframes
+            and recorder.bodies == replay.bodies
+        ))
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect and check snake replays.")
+    parser.add_argument("command", choices=["info", "check", "state"])
+    parser.add_argument("path")
+    parser.add_argument("--tick", type=int, default=None, help="tick to show with state (default: the last one)")
+    args = parser.parse_args()
+    replay = Replay.load(args.path)
+
+    if args.command == "info":
+        print(
+            "{0} on {1}x{2}, seed {3}: {4} ticks, {5} apples, {6}{7}".format(
+                replay.strategy, replay.board.width, replay.board.height, replay.seed,
+                replay.ticks, len(replay.apples) - 1, "died" if replay.died else "alive",
+                "" if replay.budget is None else ", budget {0}".format(replay.budget),
+            )
+        )
+    elif args.command == "check":
+        ok = check(replay)
+        print("identical" if ok else "DIFFERENT")
+        raise SystemExit(0 if ok else 1)
+    else:
+        until = replay.ticks if args.tick is None else min(args.tick, replay.ticks)
+        for tick, body, apple in replay.states():
+            if tick == until:
+                break
+        print("tick {0}: head {1} length {2} apple {3}".format(
+            tick, replay.board.xy(body[0]), len(body), None if apple is None else replay.board.xy(apple)
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -3,19 +3,21 @@
 
 import pygame
 import random
+import sys
 import matplotlib.pyplot as plt
 
+from board import DEFAULT_BOARD
+from body import Apple, Body, FreeCells
+import live
+from render import DirtyRenderer
+
 # Define the colors
 BLACK = (0, 0, 0)
 GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 
-# Game dimensions
-SCREEN_WIDTH = 480
-SCREEN_HEIGHT = 480
-GRIDSIZE = 20
-GRID_WIDTH = SCREEN_WIDTH // GRIDSIZE
-GRID_HEIGHT = SCREEN_HEIGHT // GRIDSIZE
+# Game dimensions: plateau par défaut, chaque serpent peut recevoir le sien
+BOARD = DEFAULT_BOARD
 
 # Directions
 UP = (0, -1)
@@ -25,16 +27,18 @@ RIGHT = (1, 0)
 
 
 class Snake:
-    def __init__(self):
+    def __init__(self, board=BOARD, rng=random):
+        self.board = board
+        self.rng = rng  # générateur de la partie: module random par défaut, ou un random.Random(seed)
         self.length = 3
-        self.positions = [(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)]
-        self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
+        self.positions = Body([board.center], FreeCells(board.cells))
+        self.direction = self.rng.choice([UP, DOWN, LEFT, RIGHT])
         # self.direction = RIGHT  # Initial direction might not be necessary
         self.color = GREEN
         self.score = 0
         self.steps = 0
         # Initialize HamiltonianCycle with the start position
-        self.hamiltonian_cycle = HamiltonianCycle(GRID_WIDTH, GRID_HEIGHT, self.positions[0], self.direction)
+        self.hamiltonian_cycle = HamiltonianCycle(board, self.positions[0], self.direction)
 
 
     def get_head_position(self):
@@ -53,53 +57,39 @@ class Snake:
         #     ((cur[0] + (x * GRIDSIZE)) % SCREEN_WIDTH),
         #     (cur[1] + (y * GRIDSIZE)) % SCREEN_HEIGHT,
         # )
-        new = self.hamiltonian_cycle.next_position(self.get_head_position())
-        if len(self.positions) > 2 and new in self.positions[2:]:
-            print("GAME OVER")
+        new = self.next_position(apple)
+        if self.positions.contains(new, skip_head=2):
             self.reset()
             apple.randomize(self.positions)
+            return True
 
-        else:
-            self.positions.insert(0, new)
-            if len(self.positions) > self.length:
-                self.positions.pop()
+        self.positions.push_head(new)
+        if len(self.positions) > self.length:
+            self.positions.pop_tail()
+        return False
+
+    def next_position(self, apple):
+        return self.hamiltonian_cycle.next_position(self.get_head_position())
 
     def reset(self):
         self.length = 3
-        self.positions = [(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)]
-        self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
+        self.positions = Body([self.board.center], FreeCells(self.board.cells))
+        self.direction = self.rng.choice([UP, DOWN, LEFT, RIGHT])
         self.score = 0
         self.steps = 0
 
+    def layers(self):
+        # Couches dessinées par render.DirtyRenderer, de la plus basse à la plus haute
+        return [(self.positions, self.color, True)]
+
     def draw(self, surface):
+        size = self.board.cell_size
         for p in self.positions:
-            r = pygame.Rect((p[0], p[1]), (GRIDSIZE, GRIDSIZE))
+            r = pygame.Rect(self.board.to_pixels(p), (size, size))
             pygame.draw.rect(surface, self.color, r)
             pygame.draw.rect(surface, BLACK, r, 1)
 
 
-class Apple:
-    def __init__(self, snake):
-        self.position = (0, 0)
-        self.color = RED
-        self.randomize(snake.positions)
-
-    def randomize(self, snake_positions):
-        while True:
-            new_position = (
-                random.randint(0, GRID_WIDTH - 1) * GRIDSIZE,
-                random.randint(0, GRID_HEIGHT - 1) * GRIDSIZE,
-            )
-            if new_position not in snake_positions:
-                break
-        self.position = new_position
-
-    def draw(self, surface):
-        r = pygame.Rect((self.position[0], self.position[1]), (GRIDSIZE, GRIDSIZE))
-        pygame.draw.rect(surface, self.color, r)
-        pygame.draw.rect(surface, BLACK, r, 1)
-
-
 # class HamiltonianCycle:
 #     def __init__(self, grid_width, grid_height):
 #         self.grid_width = grid_width
@@ -139,58 +129,130 @@ class Apple:
 #         # Retourner la position suivante dans le chemin
 #         return self.path[(index + 1) % len(self.path)]
     
-class HamiltonianCycle:
-    def __init__(self, grid_width, grid_height, start_position, direction):
-        self.grid_width = grid_width
-        self.grid_height = grid_height
-        self.start_position = start_position
-        self.path = self.generate_cycle(direction)
-
-    def generate_cycle(self, current_direction):
-        path = [self.start_position]
-        # Prioriser la direction actuelle du serpent
-        direction_order = [current_direction] + [d for d in [RIGHT, DOWN, LEFT, UP] if d != current_direction]
-        move_attempts = 0
-
-        while len(path) < self.grid_width * self.grid_height and move_attempts < len(direction_order):
-            current_position = path[-1]
-            x, y = current_position
-            grid_x, grid_y = x // GRIDSIZE, y // GRIDSIZE
-
-            for direction in direction_order:
-                dx, dy = direction
-                new_position = ((grid_x + dx) * GRIDSIZE, (grid_y + dy) * GRIDSIZE)
-
-                if (0 <= new_position[0] < SCREEN_WIDTH and 0 <= new_position[1] < SCREEN_HEIGHT and new_position not in path):
-                    path.append(new_position)
-                    move_attempts = 0  # Réinitialiser le compteur d'essais
-                    # Mettre à jour l'ordre de direction basé sur la direction actuelle
-                    direction_order = [direction] + [d for d in [RIGHT, DOWN, LEFT, UP] if d != direction]
-                    break
-                else:
-                    move_attempts += 1
-
-        return path
+def zigzag_rank(x, y, width, height):
+    # Rang de (x, y) dans le zigzag sur les lignes (height paire) qui revient par la colonne 0
+    if x == 0:
+        return (width - 1) * height + height - 1 - y
+    if y % 2 == 0:
+        return y * (width - 1) + x - 1
+    return y * (width - 1) + width - 1 - x
 
-    
-    def recalculate_cycle(self, new_start_position, direction):
-        self.start_position = new_start_position
-        self.path = self.generate_cycle(direction)
 
+def zigzag_cell(rank, width, height):
+    # Case (x, y) de rang rank, inverse de zigzag_rank
+    if rank >= (width - 1) * height:
+        return 0, height - 1 - (rank - (width - 1) * height)
+    y, k = divmod(rank, width - 1)
+    return (k + 1 if y % 2 == 0 else width - 1 - k), y
 
 
-    def next_position(self, current_position):
-        # Find the current position in the path
-        index = self.path.index(current_position)
-        # Return the next position in the path
-        return self.path[(index + 1) % len(self.path)]
+class HamiltonianCycle:
+    # Le cycle n'est pas stocké: le rang d'une case et la case d'un rang se calculent en O(1),
+    # sans table, ce qui tient aussi sur un plateau de 1000x1000
+    def __init__(self, board, start_position, direction=None):
+        self.board = board
+        self.grid_width = board.width
+        self.grid_height = board.height
+        self.size = board.cells
+        if self.grid_width < 2 or self.grid_height < 2:
+            raise ValueError("a Hamiltonian cycle needs a grid of at least 2x2 cells")
+        if self.grid_width % 2 and self.grid_height % 2:
+            raise ValueError(
+                "no Hamiltonian cycle on a {0}x{1} grid: one side must be even".format(self.grid_width, self.grid_height)
+            )
+        # Zigzag sur les lignes s'il y en a un nombre pair, sinon sur les colonnes
+        self.transposed = self.grid_height % 2 != 0
+        self.reversed = False
+        # Parcourir le cycle dans le sens où le premier pas suit la direction du serpent, si possible
+        if direction is not None:
+            ahead = board.neighbor(start_position, direction)
+            if self.position_at(self.index(start_position) - 1) == ahead:
+                self.reversed = True
+        self.recalculate_cycle(start_position, direction)
+
+    def index(self, position):
+        # Rang de la case dans le cycle
+        x, y = self.board.xy(position)
+        if self.transposed:
+            rank = zigzag_rank(y, x, self.grid_height, self.grid_width)
+        else:
+            rank = zigzag_rank(x, y, self.grid_width, self.grid_height)
+        return self.size - 1 - rank if self.reversed else rank
+
+    def position_at(self, rank):
+        # Case de rang donné (modulo la taille du cycle)
+        rank %= self.size
+        if self.reversed:
+            rank = self.size - 1 - rank
+        if self.transposed:
+            y, x = zigzag_cell(rank, self.grid_height, self.grid_width)
+        else:
+            x, y = zigzag_cell(rank, self.grid_width, self.grid_height)
+        return self.board.cell(x, y)
+
+    def generate_cycle(self):
+        # Le cycle entier, dans l'ordre où le serpent le parcourt
+        return [self.position_at(rank) for rank in range(self.size)]
 
+    def recalculate_cycle(self, new_start_position, direction=None):
+        # Le cycle reste le même: il commence simplement à la nouvelle tête, en O(1)
+        self.start_position = new_start_position
+        self.offset = self.index(new_start_position)
 
+    @property
+    def path(self):
+        # Le cycle à partir de start_position
+        return [self.position_at(self.offset + i) for i in range(self.size)]
 
-def draw_grid(surface):
-    for y in range(0, int(GRID_HEIGHT)):
-        for x in range(0, int(GRID_WIDTH)):
-            r = pygame.Rect((x * GRIDSIZE, y * GRIDSIZE), (GRIDSIZE, GRIDSIZE))
+    def next_position(self, current_position):
+        # Return the next position in the path
+        return self.position_at(self.index(current_position) + 1)
+
+    def distance(self, a, b):
+        # Nombre de pas pour aller de a à b en suivant le cycle
+        return (self.index(b) - self.index(a)) % self.size
+
+
+class ShortcutSnake(Snake):
+    """Hamiltonian snake cutting across the cycle toward the apple.
+
+    The body always lies on the cycle in order, tail first, so every cell
+    ahead of the head and before the tail is free, and the cells a jump skips
+    become holes inside the body. Following the cycle with a tail that moves
+    never brings the head closer to the tail; only growth does, and growth
+    is only safe on a body without holes, where the free cells ahead are all
+    the free cells of the board. So the head only jumps when no growth is
+    pending, stays before the tail, and lands at least ``length - 1`` steps
+    before the apple along the cycle: by the time it eats, the tail has gone
+    past the cell the head jumped to and every hole is gone.
+    """
+
+    def next_position(self, apple):
+        cycle = self.hamiltonian_cycle
+        head = self.get_head_position()
+        best = cycle.next_position(head)
+        if len(self.positions) < self.length:
+            return best  # Croissance en attente: la queue reste en place, on suit le cycle
+        room = cycle.distance(head, self.positions[-1])
+        # Rester avant la queue, et assez loin de la pomme pour que la queue rattrape le saut
+        reach = min(room - 1, cycle.distance(head, apple.position) - (self.length - 1))
+        best_distance = 1
+        for direction in (UP, DOWN, LEFT, RIGHT):
+            cell = self.board.neighbor(head, direction)
+            if cell < 0:
+                continue
+            distance = cycle.distance(head, cell)
+            if best_distance < distance <= reach:
+                best = cell
+                best_distance = distance
+        return best
+
+
+def draw_grid(surface, board=BOARD):
+    size = board.cell_size
+    for y in range(0, int(board.height)):
+        for x in range(0, int(board.width)):
+            r = pygame.Rect((x * size, y * size), (size, size))
             pygame.draw.rect(surface, BLACK, r)
 
 
@@ -202,51 +264,59 @@ def check_eat(snake, apple):
         snake.hamiltonian_cycle.recalculate_cycle(snake.get_head_position(), snake.direction)
 
 
-# Game initialization
-pygame.init()
-pygame.font.init()
-font = pygame.font.SysFont("monospace", 16)
+def tick(snake, apple):
+    # Un pas de simulation, sans affichage. Renvoie True si le serpent est mort.
+    if apple.complete:
+        return False  # Plateau rempli: plus de pomme, la partie est gagnée
+    died = snake.move(apple)
+    check_eat(snake, apple)
+    return died
 
-clock = pygame.time.Clock()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
 
-surface = pygame.Surface(screen.get_size())
-surface = surface.convert()
-draw_grid(surface)
+def main(board=BOARD, turbo=False):
+    pygame.init()
+    pygame.font.init()
 
-snake = Snake()
-apple = Apple(snake)
+    screen = pygame.display.set_mode((board.screen_width, board.screen_height), 0, 32)
 
-scores = []
-steps = []
+    # Fond dessiné une fois par draw_grid, puis seules les cases qui changent sont redessinées
+    renderer = DirtyRenderer(screen, board, draw_grid)
 
-while True:
-    clock.tick(100)
-    snake.move(apple)
-    check_eat(snake, apple)
-    draw_grid(surface)
-    snake.draw(surface)
-    apple.draw(surface)
-    screen.blit(surface, (0, 0))
-
-    text = font.render("Score {0}".format(snake.score), 1, (255, 255, 255))
-    screen.blit(text, (5, 10))
-    text = font.render("Steps {0}".format(snake.steps), 1, (255, 255, 255))
-    screen.blit(text, (5, 30))
-    pygame.display.update()
-
-    scores.append(snake.score)
-    snake.steps += 1
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_UP:
-                snake.turn(UP)
-            elif event.key == pygame.K_DOWN:
-                snake.turn(DOWN)
-            elif event.key == pygame.K_LEFT:
-                snake.turn(LEFT)
-            elif event.key == pygame.K_RIGHT:
-                snake.turn(RIGHT)
+    snake = Snake(board)
+    apple = Apple(snake)
+
+    scores = []
+    steps = []
+
+    def step():
+        if tick(snake, apple):
+            print("GAME OVER")
+        scores.append(snake.score)
+        snake.steps += 1
+
+    def draw():
+        renderer.render(snake, apple, ["Score {0}".format(snake.score), "Steps {0}".format(snake.steps)])
+
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return False
+            elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_UP:
+                    snake.turn(UP)
+                elif event.key == pygame.K_DOWN:
+                    snake.turn(DOWN)
+                elif event.key == pygame.K_LEFT:
+                    snake.turn(LEFT)
+                elif event.key == pygame.K_RIGHT:
+                    snake.turn(RIGHT)
+
+    # Simulation et affichage à des rythmes séparés, voir live.run
+    if turbo:
+        live.run(step, draw)
+    else:
+        live.run(step, draw, tick_rate=100, fps=60)
+
+
+if __name__ == "__main__":
+    main(turbo="--turbo" in sys.argv[1:])
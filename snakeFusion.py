@@ -1,87 +1,165 @@
 import pygame
 import random
+import sys
 import heapq
+from itertools import islice
+
+from board import DEFAULT_BOARD
+from body import Apple, Body, FreeCells
+from lookahead import TranspositionTable, ZobristKeys
+import live
+from render import DirtyRenderer
 
 # Define the colors
 BLACK = (0, 0, 0)
 GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 
-# Game dimensions
-SCREEN_WIDTH = 480
-SCREEN_HEIGHT = 480
-GRIDSIZE = 20
-GRID_WIDTH = SCREEN_WIDTH // GRIDSIZE
-GRID_HEIGHT = SCREEN_HEIGHT // GRIDSIZE
+# Game dimensions: plateau par défaut, chaque serpent peut recevoir le sien
+BOARD = DEFAULT_BOARD
 
 class Node:
     def __init__(self, position):
         self.position = position
         self.distance = float('inf')
         self.previous = None
+        self.generation = 0  # recherche à laquelle distance et previous appartiennent
+        self.closed = 0  # dernière recherche où le noeud a été visité
+        self.neighbors = None
 
     def __lt__(self, other):
         return self.distance < other.distance
 
-def get_free_spaces(position, body_positions):
+
+class GridGraph:
+    # Graphe des cases gardé d'une recherche à l'autre: chaque recherche prend un nouveau
+    # numéro de génération au lieu de recréer ses noeuds, et les coûts de mobilité sont
+    # calculés à la demande puis gardés par case tant que le corps ne change pas.
+    # Les noeuds sont créés à la première visite: un grand plateau ne coûte que les cases atteintes.
+    def __init__(self, board=BOARD):
+        self.board = board
+        self.nodes = {}
+        self.generation = 0
+        self.body_key = None
+        self.mobility = {}
+        self.table = TranspositionTable(1 << 18)
+
+    def __getitem__(self, position):
+        node = self.nodes.get(position)
+        if node is None:
+            node = self.nodes[position] = Node(position)
+        return node
+
+    def neighbors(self, node):
+        # Voisins du noeud, reliés à sa première expansion
+        if node.neighbors is None:
+            cells = [self.board.neighbor(node.position, direction) for direction in [(0, -1), (0, 1), (-1, 0), (1, 0)]]
+            node.neighbors = [self[cell] for cell in cells if cell >= 0]
+        return node.neighbors
+
+    def begin_search(self, body_key):
+        self.generation += 1
+        if body_key != self.body_key:
+            self.body_key = body_key
+            self.mobility.clear()
+
+    def fresh(self, node):
+        # Remet le noeud à zéro s'il date d'une recherche précédente
+        if node.generation != self.generation:
+            node.generation = self.generation
+            node.distance = float('inf')
+            node.previous = None
+        return node
+
+    def mobility_cost(self, position, blocked):
+        cost = self.mobility.get(position)
+        if cost is None:
+            blocked.add(position)
+            cost = future_mobility(position, blocked, self.body_key ^ ZOBRIST[position], 3, self.board, self.table)
+            blocked.remove(position)
+            self.mobility[position] = cost
+        return cost
+
+def get_free_spaces(position, body_positions, board=BOARD):
     count = 0
-    for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-        neighbor_pos = (position[0] + dx * GRIDSIZE, position[1] + dy * GRIDSIZE)
-        if (0 <= neighbor_pos[0] < SCREEN_WIDTH and 0 <= neighbor_pos[1] < SCREEN_HEIGHT) and (neighbor_pos not in body_positions):
+    for neighbor_pos, _, _ in board.neighbors[position]:
+        if neighbor_pos not in body_positions:
             count += 1
     return count
 
-from functools import lru_cache
-@lru_cache(maxsize=None)
-def simulate_future_mobility(position, body_positions, depth):
-
-    if depth == 0:
-        return 0
+# Clés de Zobrist des cases, tirées à la première rencontre de chaque case
+ZOBRIST = ZobristKeys()
 
-    max_spaces = 0
-    x, y = position
-    future_body_positions = set(body_positions)
-    future_body_positions.add(position)
 
-    # Évaluer chaque direction possible
-    for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-        next_pos = (x + dx * GRIDSIZE, y + dy * GRIDSIZE)
-        if is_valid_position(next_pos, future_body_positions):
-            local_spaces = get_free_spaces(next_pos, future_body_positions)
-            # Recursion pour voir plus loin dans le futur
-            future_result = simulate_future_mobility(next_pos, future_body_positions, depth - 1)
-            max_spaces = max(max_spaces, local_spaces + future_result)
+def simulate_future_mobility(position, body_positions, depth, board=BOARD):
+    # Une seule copie du corps, modifiée sur place puis restaurée pendant la recherche
+    blocked = set(body_positions)
+    table = graph_for(board).table
+    return future_mobility(position, blocked, ZOBRIST.hash(blocked), depth, board, table)
 
-            future_body_positions.remove(next_pos)  # Retirez pour ne pas affecter les autres branches
 
+def future_mobility(position, blocked, key, depth, board, table):
+    # key est le hash de Zobrist de blocked, tenu à jour par XOR à chaque case ajoutée ou retirée;
+    # table garde les résultats déjà calculés sur ce plateau
+    if depth == 0:
+        return 0
+    entry = (key, position, depth)
+    cached = table.get(entry)
+    if cached is not None:
+        return cached
+
+    # Au plus 3 cases libres par pas, 4 au premier si la position de départ est libre:
+    # une fois ce maximum atteint, les autres branches ne peuvent pas faire mieux
+    bound = 3 * depth + (position not in blocked)
+    # L'ordre des voisins ne change pas le maximum: on suit celui de la table du plateau
+    max_spaces = 0
+    for next_pos, _, _ in board.neighbors[position]:
+        if next_pos not in blocked:
+            blocked.add(next_pos)
+            next_key = key ^ ZOBRIST[next_pos]
+            spaces = get_free_spaces(next_pos, blocked, board) + future_mobility(next_pos, blocked, next_key, depth - 1, board, table)
+            blocked.remove(next_pos)  # Retirez pour ne pas affecter les autres branches
+            if spaces > max_spaces:
+                max_spaces = spaces
+                if max_spaces >= bound:
+                    break
+
+    table.put(entry, max_spaces)
     return max_spaces
 
 
 def move_survival(snake, apple):
-    head_x, head_y = snake.get_head_position()
+    head = snake.get_head_position()
+    board = snake.board
     best_option = None
     best_score = -float('inf')
 
     depth = min(10, max(3, len(snake.positions) // 5))
-
-    for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-        next_pos = (head_x + dx * GRIDSIZE, head_y + dy * GRIDSIZE)
-        if is_valid_position(next_pos, snake.positions):
-            free_spaces = get_free_spaces(next_pos, snake.positions)
-            future_mobility = simulate_future_mobility(next_pos, snake.positions, depth)  # Profondeur ajustable selon les besoins
+    profiler = snake.profiler
+    if profiler:
+        began = profiler.clock()
+        profiler.peak("depth", depth)
+
+    for direction in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+        next_pos = board.neighbor(head, direction)
+        if is_valid_position(next_pos, snake.positions, board):
+            free_spaces = get_free_spaces(next_pos, snake.positions, board)
+            future_mobility = simulate_future_mobility(next_pos, snake.positions, depth, board)  # Profondeur ajustable selon les besoins
             score = free_spaces * 10 + future_mobility * 2  # Ajuster les poids selon la stratégie
 
             if score > best_score:
                 best_score = score
                 best_option = next_pos
 
-    if best_option:
+    if profiler:
+        profiler.add("survival", profiler.clock() - began)
+    if best_option is not None:
         snake.path.append(best_option)  # Planifiez le mouvement sans exécuter immédiatement
         # Après un mouvement survival, vérifiez si le chemin reste valide
         if not is_path_safe(snake.path, snake):
             update_path(snake, apple)  # Recalculer le chemin si nécessaire
-        return False
-    return True
+    # Case choisie, ou None si aucune voisine de la tête n'est libre
+    return best_option
 
 
 
@@ -89,26 +167,25 @@ def move_survival(snake, apple):
 
 
 
-def are_adjacent(pos1, pos2):
-    return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1]) == GRIDSIZE
+def are_adjacent(pos1, pos2, board=BOARD):
+    return board.distance(pos1, pos2) == 1
 
 def get_adjacent_body_positions(snake):
     # Cette fonction devrait renvoyer toutes les positions adjacentes au serpent qui ne sont pas occupées par lui-même
     adjacent_positions = set()
-    for body_part in snake.positions[1:]:
-        x, y = body_part
-        for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-            adjacent_pos = (x + dx * GRIDSIZE, y + dy * GRIDSIZE)
-            if is_valid_position(adjacent_pos, snake.positions) and adjacent_pos not in snake.positions:
+    for body_part in islice(snake.positions, 1, None):
+        for direction in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
+            adjacent_pos = snake.board.neighbor(body_part, direction)
+            if is_valid_position(adjacent_pos, snake.positions, snake.board) and adjacent_pos not in snake.positions:
                 adjacent_positions.add(adjacent_pos)
     return adjacent_positions
 
 
-def calculate_distance_to_body(position, body_positions):
+def calculate_distance_to_body(position, body_positions, board=BOARD):
     # Calculate the Manhattan distance from the position to the closest body part
     min_distance = float('inf')
     for body_part in body_positions:  # body_positions est déjà un ensemble de positions
-        distance = abs(position[0] - body_part[0]) + abs(position[1] - body_part[1])
+        distance = board.distance(position, body_part)
         min_distance = min(min_distance, distance)
     return min_distance
 
@@ -116,88 +193,80 @@ def calculate_distance_to_body(position, body_positions):
 
 
 
-def is_valid_position(pos, body_positions):
-    x, y = pos
-    return (0 <= x < SCREEN_WIDTH) and (0 <= y < SCREEN_HEIGHT) and (pos not in body_positions)
-
-def simulate_future_mobility(position, body_positions, depth):
-    if depth == 0:
-        return 0
-    max_spaces = 0
-    x, y = position
-    for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-        next_pos = (x + dx * GRIDSIZE, y + dy * GRIDSIZE)
-        if is_valid_position(next_pos, body_positions):
-            # Assurez-vous que future_body_positions est un set pour utiliser add
-            future_body_positions = set(body_positions)  # Créez un nouveau set à partir de body_positions
-            future_body_positions.add(next_pos)
-            max_spaces = max(max_spaces, get_free_spaces(next_pos, future_body_positions) + simulate_future_mobility(next_pos, future_body_positions, depth - 1))
-    return max_spaces
-
+def is_valid_position(pos, body_positions, board=BOARD):
+    # Les cases hors du plateau valent -1 (voir Board.neighbor)
+    return 0 <= pos < board.cells and pos not in body_positions
 
 def update_snake_position(snake, next_pos):
     if len(snake.positions) >= snake.length:
-        snake.positions.pop()
-    snake.positions.insert(0, next_pos)
+        snake.positions.pop_tail()
+    snake.positions.push_head(next_pos)
 
 
 def evaluate_future_moves(position, snake):
     # This function needs to be implemented to simulate future moves
     # For now, return a simple heuristic based on available space
-    return get_free_spaces(position, set(snake.positions))
+    return get_free_spaces(position, set(snake.positions), snake.board)
 
 
 
 def dijkstra(graph, start_pos, end_pos, body_positions):
-    start = graph[start_pos]
-    end = graph[end_pos]
+    # Guidée vers la pomme par la distance de Manhattan: chaque pas coûte au moins 1, l'estimation
+    # ne dépasse jamais le vrai coût et le chemin reste le plus court, sans explorer tout le plateau
+    blocked = set(body_positions)
+    graph.begin_search(ZOBRIST.hash(blocked))
+    generation = graph.generation
+    start = graph.fresh(graph[start_pos])
+    end = graph.fresh(graph[end_pos])
     start.distance = 0
-    queue = [(0, start)]  # La queue stocke une tuple de (distance, noeud)
+    height = graph.board.height
+    end_x, end_y = divmod(end_pos, height)
+    queue = [(0, start)]  # La queue stocke une tuple de (distance estimée, noeud)
 
-    visited = set()
-    
     while queue:
-        current_distance, current = heapq.heappop(queue)
-        if current.position in visited:
+        _, current = heapq.heappop(queue)
+        if current.closed == generation:
             continue
-        visited.add(current.position)
-        if current.position == end.position:
+        current.closed = generation
+        if current is end:
             break
-
-        for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]:
-            x, y = current.position
-            neighbor_pos = (x + dx * GRIDSIZE, y + dy * GRIDSIZE)
-            if is_valid_position(neighbor_pos, body_positions):
-                if neighbor_pos in visited:
-                    continue
-                neighbor = graph.get(neighbor_pos, Node(neighbor_pos))
-                mobility_score = simulate_future_mobility(neighbor_pos, set(body_positions) | {neighbor_pos}, 3)
-                new_dist = current_distance + 1 + mobility_score * 0.1  # Inclure la mobilité future dans le score
-                if new_dist < neighbor.distance:
-                    neighbor.distance = new_dist
-                    neighbor.previous = current
-                    heapq.heappush(queue, (new_dist, neighbor))
+        current_distance = current.distance
+
+        for neighbor in graph.neighbors(current):
+            if neighbor.position in blocked or neighbor.closed == generation:
+                continue
+            graph.fresh(neighbor)
+            mobility_score = graph.mobility_cost(neighbor.position, blocked)
+            new_dist = current_distance + 1 + mobility_score * 0.1  # Inclure la mobilité future dans le score
+            if new_dist < neighbor.distance:
+                neighbor.distance = new_dist
+                neighbor.previous = current
+                x, y = divmod(neighbor.position, height)
+                estimate = new_dist + abs(x - end_x) + abs(y - end_y)
+                heapq.heappush(queue, (estimate, neighbor))
 
     # Reconstruire le chemin
     path = []
     while end.previous:
-        path.insert(0, end.position)
+        path.append(end.position)
         end = end.previous
-    return path
-
+    return path[::-1]
 
 
 class Snake:
-    def __init__(self):
+    def __init__(self, board=BOARD, rng=random):
+        self.board = board
+        self.rng = rng  # générateur de la partie: module random par défaut, ou un random.Random(seed)
         self.length = 3
-        self.positions = [((SCREEN_WIDTH // 2), (SCREEN_HEIGHT // 2))]
+        self.positions = Body([board.center], FreeCells(board.cells))
         self.score = 0
         self.path = []
         self.color = GREEN  # Define the color attribute here.
+        self.profiler = None  # profiling.Profiler pour mesurer chaque tick, désactivé par défaut
     
     def reset(self):
         self.length = 3
-        self.positions = [((SCREEN_WIDTH // 2), (SCREEN_HEIGHT // 2))]
+        self.positions = Body([self.board.center], FreeCells(self.board.cells))
         self.score = 0
         self.path = []
     
@@ -209,97 +278,97 @@ class Snake:
         if self.path:
             next_pos = self.path.pop(0)
             # Vérifiez si la nouvelle tête est sur un segment du corps autre que l'ancienne queue (si la queue va bouger)
-            if next_pos in self.positions[1:-1]:  # Ne vérifiez pas l'ancienne queue
+            if self.positions.contains(next_pos, skip_head=1, skip_tail=1):  # Ne vérifiez pas l'ancienne queue
                 return True
             if len(self.positions) >= self.length:
-                self.positions.pop()  # Enlève l'ancienne queue
-            self.positions.insert(0, next_pos)  # Ajoute la nouvelle tête
+                self.positions.pop_tail()  # Enlève l'ancienne queue
+            self.positions.push_head(next_pos)  # Ajoute la nouvelle tête
         return False
 
     
     def grow(self):
         self.length += 1
     
+    def layers(self):
+        # Couches dessinées par render.DirtyRenderer: le chemin d'abord, le corps par-dessus
+        return [(self.path, (0, 0, 255), False), (self.positions, self.color, True)]
+
     def draw(self, surface):
+        size = self.board.cell_size
         # Draw the path first
         for p in self.path:
-            rect = pygame.Rect((p[0], p[1]), (GRIDSIZE, GRIDSIZE))
+            rect = pygame.Rect(self.board.to_pixels(p), (size, size))
             pygame.draw.rect(surface, (0, 0, 255), rect)  # Draw in blue
 
         # Draw the snake body
         for p in self.positions:
-            rect = pygame.Rect((p[0], p[1]), (GRIDSIZE, GRIDSIZE))
+            rect = pygame.Rect(self.board.to_pixels(p), (size, size))
             pygame.draw.rect(surface, self.color, rect)
             pygame.draw.rect(surface, BLACK, rect, 1)
 
     
     def move_anyway(self):
-        head_x, head_y = self.get_head_position()
-        possible_directions = [(head_x + dx * GRIDSIZE, head_y + dy * GRIDSIZE)
-                               for dx, dy in [(0, -1), (0, 1), (-1, 0), (1, 0)]]
+        head = self.get_head_position()
+        possible_directions = [self.board.neighbor(head, direction)
+                               for direction in [(0, -1), (0, 1), (-1, 0), (1, 0)]]
         
-        # Filter out positions that would collide with the snake's body
-        possible_directions = [pos for pos in possible_directions if pos not in self.positions]
+        # Filter out positions that would collide with the snake's body or leave the board
+        possible_directions = [pos for pos in possible_directions if pos >= 0 and pos not in self.positions]
         
         # If there's nowhere to move (completely trapped), reset the game
         if not possible_directions:
             return True
 
         # Choose a random direction to move that does not result in a collision
-        next_pos = random.choice(possible_directions)
-        self.positions.pop()
-        self.positions.insert(0, next_pos)
+        next_pos = self.rng.choice(possible_directions)
+        self.positions.pop_tail()
+        self.positions.push_head(next_pos)
         return False
 
-class Apple:
-    def __init__(self):
-        self.color = RED  # Define the color attribute for the apple
-        self.randomize(snake.positions)  # Make sure this line comes after the color definition
-    
-    def randomize(self, snake_positions):
-        while True:
-            new_position = (random.randint(0, GRID_WIDTH - 1) * GRIDSIZE, random.randint(0, GRID_HEIGHT - 1) * GRIDSIZE)
-            if new_position not in snake_positions:
-                self.position = new_position
-                break
-    
-    def draw(self, surface):
-        r = pygame.Rect((self.position[0], self.position[1]), (GRIDSIZE, GRIDSIZE))
-        pygame.draw.rect(surface, self.color, r)  # Now self.color is defined
-        pygame.draw.rect(surface, BLACK, r, 1)
-
-
 def check_collision(snake, apple):
     if snake.get_head_position() == apple.position:
         snake.grow()
         snake.score += 1  # Augmenter le score quand le serpent mange une pomme
+        profiler = snake.profiler
+        began = profiler and profiler.clock()
         apple.randomize(snake.positions)  # Placez une nouvelle pomme
+        if profiler:
+            profiler.add("respawn", profiler.clock() - began)
         update_path(snake, apple)  # Recalculez le chemin après la croissance
         return True
     return False
 
 
 def update_path(snake, apple):
+    if apple.complete:
+        snake.path = []
+        return
+    profiler = snake.profiler
+    began = profiler and profiler.clock()
     body_positions = set(snake.positions)
-    graph = {((x * GRIDSIZE), (y * GRIDSIZE)): Node(((x * GRIDSIZE), (y * GRIDSIZE))) for x in range(GRID_WIDTH) for y in range(GRID_HEIGHT)}
+    graph = graph_for(snake.board)
     initial_path = dijkstra(graph, snake.get_head_position(), apple.position, body_positions)
 
     if is_path_safe(initial_path, snake):
         snake.path = initial_path
     else:
         snake.path = calculate_safe_path(graph, snake, apple, body_positions)
+        if profiler:
+            profiler.add("replans")
+    if profiler:
+        profiler.add("search", profiler.clock() - began)
 
 
 
 def is_path_safe(path, snake):
     # Simuler le mouvement du serpent le long du chemin pour vérifier les issues potentielles
-    simulated_positions = list(snake.positions)
+    simulated_positions = Body(snake.positions)
     for pos in path:
-        if not simulate_future_mobility(pos, simulated_positions, 3):  # Profondeur de simulation arbitraire
+        if not simulate_future_mobility(pos, simulated_positions, 3, snake.board):  # Profondeur de simulation arbitraire
             return False
-        simulated_positions.insert(0, pos)  # Simuler le mouvement
+        simulated_positions.push_head(pos)  # Simuler le mouvement
         if len(simulated_positions) > snake.length:
-            simulated_positions.pop()
+            simulated_positions.pop_tail()
     return True
 
 def calculate_safe_path(graph, snake, apple, body_positions):
@@ -308,48 +377,83 @@ def calculate_safe_path(graph, snake, apple, body_positions):
     return dijkstra(graph, snake.get_head_position(), apple.position, body_positions - {snake.positions[-1]})
 
 
-def reset_game():
+# Graphes partagés par toutes les recherches de update_path, un par plateau
+GRAPHS = {}
+
+
+def graph_for(board):
+    graph = GRAPHS.get(board)
+    if graph is None:
+        graph = GRAPHS[board] = GridGraph(board)
+    return graph
+
+
+def reset_game(snake, apple):
     snake.reset()
     apple.randomize(snake.positions)
     update_path(snake, apple)
 
-pygame.init()
-clock = pygame.time.Clock()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
-surface = pygame.Surface(screen.get_size()).convert()
-pygame.font.init()
-font = pygame.font.SysFont("monospace", 16)
 
-snake = Snake()
-apple = Apple()
-update_path(snake, apple)
+def tick(snake, apple):
+    # Un pas de simulation, sans affichage. Renvoie True si le serpent est mort.
+    if apple.complete:
+        return False  # Plateau rempli: plus de pomme, la partie est gagnée
+    profiler = snake.profiler
+    if profiler is None:
+        return advance(snake, apple)
+    profiler.begin()
+    died = advance(snake, apple)
+    profiler.end(died)
+    return died
 
-while True:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            exit()
 
+def advance(snake, apple):
+    # Le pas de tick, hors profilage
     if not snake.path:
-        if not move_survival(snake, apple):  # Si le serpent est capable de bouger
-            update_path(snake, apple)  # Tentez de recalculer le chemin
-        else:
-            reset_game()  # Si le serpent est complètement bloqué, réinitialiser le jeu
-        continue
+        survival = move_survival(snake, apple)
+        if survival is None:
+            reset_game(snake, apple)  # Si le serpent est complètement bloqué, réinitialiser le jeu
+            return True
+        update_path(snake, apple)  # Tentez de recalculer le chemin
+        if not snake.path:
+            # Aucun chemin ne remplace le mouvement de survie: il reste le prochain pas,
+            # sans quoi le serpent resterait figé à chaque tick
+            snake.path = [survival]
+        return False
 
-    moved = snake.move()
-    if moved:  # Si le serpent se heurte à lui-même
-        reset_game()
+    if snake.move():  # Si le serpent se heurte à lui-même
+        reset_game(snake, apple)
+        return True
 
     if check_collision(snake, apple):
         update_path(snake, apple)  # Assurez-vous de mettre à jour après avoir mangé et possiblement grandi
-        continue
-
-    surface.fill(BLACK)
-    snake.draw(surface)
-    apple.draw(surface)
-    screen.blit(surface, (0, 0))
-    text = font.render(f"Score {snake.score}", True, (255, 255, 255))
-    screen.blit(text, (5, 10))
-    pygame.display.update()
-    clock.tick(100)
\ No newline at end of file
+    return False
+
+
+def main(board=BOARD, turbo=False):
+    pygame.init()
+    screen = pygame.display.set_mode((board.screen_width, board.screen_height), 0, 32)
+    pygame.font.init()
+    renderer = DirtyRenderer(screen, board)
+
+    snake = Snake(board)
+    apple = Apple(snake)
+    update_path(snake, apple)
+
+    def draw():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return False
+
+        renderer.render(snake, apple, [f"Score {snake.score}"])
+
+    # Simulation et affichage à des rythmes séparés, voir live.run
+    if turbo:
+        live.run(lambda: tick(snake, apple), draw)
+    else:
+        live.run(lambda: tick(snake, apple), draw, tick_rate=100, fps=60)
+
+
+if __name__ == "__main__":
+    main(turbo="--turbo" in sys.argv[1:])
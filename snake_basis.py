@@ -3,19 +3,21 @@
 
 import pygame
 import random
+import sys
 import matplotlib.pyplot as plt
 
+from board import DEFAULT_BOARD
+from body import Apple, Body, FreeCells
+import live
+from render import DirtyRenderer
+
 # Define the colors
 BLACK = (0, 0, 0)
 GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 
-# Game dimensions
-SCREEN_WIDTH = 480
-SCREEN_HEIGHT = 480
-GRIDSIZE = 20
-GRID_WIDTH = SCREEN_WIDTH // GRIDSIZE
-GRID_HEIGHT = SCREEN_HEIGHT // GRIDSIZE
+# Game dimensions: plateau par défaut, chaque serpent peut recevoir le sien
+BOARD = DEFAULT_BOARD
 
 # Directions
 UP = (0, -1)
@@ -25,10 +27,12 @@ RIGHT = (1, 0)
 
 
 class Snake:
-    def __init__(self):
+    def __init__(self, board=BOARD, rng=random):
+        self.board = board
+        self.rng = rng  # générateur de la partie: module random par défaut, ou un random.Random(seed)
         self.length = 3
-        self.positions = [(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)]
-        self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
+        self.positions = Body([board.center], FreeCells(board.cells))
+        self.direction = self.rng.choice([UP, DOWN, LEFT, RIGHT])
         self.color = GREEN
         self.score = 0
         self.steps = 0
@@ -44,60 +48,41 @@ class Snake:
 
     def move(self, apple):
         cur = self.get_head_position()
-        x, y = self.direction
-        new = (
-            ((cur[0] + (x * GRIDSIZE)) % SCREEN_WIDTH),
-            (cur[1] + (y * GRIDSIZE)) % SCREEN_HEIGHT,
-        )
-        if len(self.positions) > 2 and new in self.positions[2:]:
+        new = self.board.wrap(cur, self.direction)
+        if self.positions.contains(new, skip_head=2):
             self.reset()
             apple.randomize(self.positions)
+            return True
 
-        else:
-            self.positions.insert(0, new)
-            if len(self.positions) > self.length:
-                self.positions.pop()
+        self.positions.push_head(new)
+        if len(self.positions) > self.length:
+            self.positions.pop_tail()
+        return False
 
     def reset(self):
         self.length = 3
-        self.positions = [(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2)]
-        self.direction = random.choice([UP, DOWN, LEFT, RIGHT])
+        self.positions = Body([self.board.center], FreeCells(self.board.cells))
+        self.direction = self.rng.choice([UP, DOWN, LEFT, RIGHT])
         self.score = 0
         self.steps = 0
 
+    def layers(self):
+        # Couches dessinées par render.DirtyRenderer, de la plus basse à la plus haute
+        return [(self.positions, self.color, True)]
+
     def draw(self, surface):
+        size = self.board.cell_size
         for p in self.positions:
-            r = pygame.Rect((p[0], p[1]), (GRIDSIZE, GRIDSIZE))
+            r = pygame.Rect(self.board.to_pixels(p), (size, size))
             pygame.draw.rect(surface, self.color, r)
             pygame.draw.rect(surface, BLACK, r, 1)
 
 
-class Apple:
-    def __init__(self, snake):
-        self.position = (0, 0)
-        self.color = RED
-        self.randomize(snake.positions)
-
-    def randomize(self, snake_positions):
-        while True:
-            new_position = (
-                random.randint(0, GRID_WIDTH - 1) * GRIDSIZE,
-                random.randint(0, GRID_HEIGHT - 1) * GRIDSIZE,
-            )
-            if new_position not in snake_positions:
-                break
-        self.position = new_position
-
-    def draw(self, surface):
-        r = pygame.Rect((self.position[0], self.position[1]), (GRIDSIZE, GRIDSIZE))
-        pygame.draw.rect(surface, self.color, r)
-        pygame.draw.rect(surface, BLACK, r, 1)
-
-
-def draw_grid(surface):
-    for y in range(0, int(GRID_HEIGHT)):
-        for x in range(0, int(GRID_WIDTH)):
-            r = pygame.Rect((x * GRIDSIZE, y * GRIDSIZE), (GRIDSIZE, GRIDSIZE))
+def draw_grid(surface, board=BOARD):
+    size = board.cell_size
+    for y in range(0, int(board.height)):
+        for x in range(0, int(board.width)):
+            r = pygame.Rect((x * size, y * size), (size, size))
             pygame.draw.rect(surface, BLACK, r)
 
 
@@ -108,42 +93,41 @@ def check_eat(snake, apple):
         apple.randomize(snake.positions)
 
 
-# Game initialization
-pygame.init()
-pygame.font.init()
-font = pygame.font.SysFont("monospace", 16)
+def main(board=BOARD, turbo=False):
+    pygame.init()
+    pygame.font.init()
+
+    screen = pygame.display.set_mode((board.screen_width, board.screen_height), 0, 32)
+
+    # Fond dessiné une fois par draw_grid, puis seules les cases qui changent sont redessinées
+    renderer = DirtyRenderer(screen, board, draw_grid)
 
-clock = pygame.time.Clock()
-screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), 0, 32)
+    snake = Snake(board)
+    apple = Apple(snake)
 
-surface = pygame.Surface(screen.get_size())
-surface = surface.convert()
-draw_grid(surface)
+    scores = []
+    steps = []
 
-snake = Snake()
-apple = Apple(snake)
+    def step():
+        snake.move(apple)
+        check_eat(snake, apple)
+        scores.append(snake.score)
+        snake.steps += 1
 
-scores = []
-steps = []
+    def draw():
+        renderer.render(snake, apple, ["Score {0}".format(snake.score), "Steps {0}".format(snake.steps)])
 
-while True:
-    clock.tick(10)
-    snake.move(apple)
-    check_eat(snake, apple)
-    draw_grid(surface)
-    snake.draw(surface)
-    apple.draw(surface)
-    screen.blit(surface, (0, 0))
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return False
 
-    text = font.render("Score {0}".format(snake.score), 1, (255, 255, 255))
-    screen.blit(text, (5, 10))
-    text = font.render("Steps {0}".format(snake.steps), 1, (255, 255, 255))
-    screen.blit(text, (5, 30))
-    pygame.display.update()
+    # 10 ticks par seconde pour un joueur humain; l'affichage suit à 30 images par seconde
+    if turbo:
+        live.run(step, draw)
+    else:
+        live.run(step, draw, tick_rate=10, fps=30)
 
-    scores.append(snake.score)
-    snake.steps += 1
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
+if __name__ == "__main__":
+    main(turbo="--turbo" in sys.argv[1:])
@@ -0,0 +1,43 @@
+import random
+from collections import deque
+
+import pytest
+
+from connectivity import ConnectivityIndex
+from pathfinding import grid_neighbors
+
+
+def flood_sizes(width, height, free):
+    # Taille de la région de chaque case libre, par un parcours en largeur complet
+    neighbors = grid_neighbors(width, height)
+    sizes = [0] * (width * height)
+    for cell in range(width * height):
+        if free[cell] and not sizes[cell]:
+            region = {cell}
+            queue = deque([cell])
+            while queue:
+                current = queue.popleft()
+                for neighbor, _, _ in neighbors[current]:
+                    if free[neighbor] and neighbor not in region:
+                        region.add(neighbor)
+                        queue.append(neighbor)
+            for member in region:
+                sizes[member] = len(region)
+    return sizes
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_region_size_matches_flood_fill(seed):
+    # Après chaque case bloquée ou libérée, l'index donne les tailles d'un étiquetage refait
+    rng = random.Random(seed)
+    width, height = rng.randint(2, 12), rng.randint(2, 12)
+    grid = [1 if rng.random() < 0.4 else 0 for _ in range(width * height)]
+    index = ConnectivityIndex(width, height, grid)
+    for _ in range(200):
+        cell = rng.randrange(width * height)
+        if index.free[cell]:
+            index.block_cell(cell)
+        else:
+            index.free_cell(cell)
+        sizes = flood_sizes(width, height, index.free)
+        assert [index.region_size(cell) for cell in range(width * height)] == sizes
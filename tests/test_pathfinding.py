@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from pathfinding import GridSearch, IncrementalSearch, grid_neighbors
+
+
+def check_path(grid, width, height, start, goal, path):
+    # Chemin de cases voisines et libres, de la case après start jusqu'à goal
+    neighbors = grid_neighbors(width, height)
+    previous = start
+    for cell in path:
+        assert cell in [neighbor for neighbor, _, _ in neighbors[previous]]
+        assert not grid[cell]
+        previous = cell
+    assert not path or path[-1] == goal
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_incremental_matches_grid_search(seed):
+    # Le planificateur incrémental, réparé entre les appels, trouve des chemins aussi courts
+    # qu'une recherche A* refaite de zéro sur la même grille
+    rng = random.Random(seed)
+    width, height = rng.randint(4, 20), rng.randint(4, 20)
+    grid = [1 if rng.random() < 0.25 else 0 for _ in range(width * height)]
+    neighbors = grid_neighbors(width, height)
+    incremental = IncrementalSearch(width, height)
+    fresh = GridSearch(width, height)
+    start = rng.randrange(width * height)
+    goal = rng.randrange(width * height)
+    grid[goal] = 0
+    for _ in range(60):
+        changed = []
+        for _ in range(rng.randint(0, 3)):
+            cell = rng.randrange(width * height)
+            if cell != goal:
+                grid[cell] ^= 1
+                changed.append(cell)
+        if rng.random() < 0.5:
+            start = rng.choice([neighbor for neighbor, _, _ in neighbors[start]])
+        if rng.random() < 0.1:
+            goal = rng.randrange(width * height)
+            grid[goal] = 0
+        path = incremental.plan(grid, start, goal, changed)
+        assert not incremental.interrupted
+        # La case de départ porte la tête: elle reste traversable
+        unblocked = list(grid)
+        unblocked[start] = 0
+        expected = fresh.search(unblocked, start, goal)
+        assert len(path) == len(expected)
+        check_path(unblocked, width, height, start, goal, path)
+
+
+def test_interrupted_search_resumes():
+    # Une recherche coupée par sa limite reprend au prochain appel et finit sur le même chemin
+    width, height = 15, 15
+    grid = [0] * (width * height)
+    for y in range(height - 1):
+        grid[7 * height + y] = 1
+    start, goal = 0, (width - 1) * height
+    incremental = IncrementalSearch(width, height)
+    path = []
+    limit = 5
+    for _ in range(200):
+        path = incremental.plan(grid, start, goal, limit=incremental.expansions + limit)
+        if not incremental.interrupted:
+            break
+    assert not incremental.interrupted
+    assert len(path) == len(GridSearch(width, height).search(grid, start, goal))
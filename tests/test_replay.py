@@ -0,0 +1,41 @@
+import pytest
+
+from board import Board
+from headless import run_game
+from replay import HEADER, HEADER_V2, Replay, ReplayIndex, ReplayRecorder, check
+
+
+def record(strategy, seed, interval=100):
+    recorder = ReplayRecorder(interval)
+    run_game(strategy, 2000, seed=seed, board=Board(10, 8), recorder=recorder)
+    return recorder.to_bytes()
+
+
+@pytest.mark.parametrize("strategy", ["a_star", "hamiltonian", "shortcut", "fusion"])
+def test_recorded_keyframes_match_playback(strategy):
+    # Les images clés écrites pendant la partie sont celles que la relecture reconstruit
+    replay = Replay(record(strategy, 3))
+    assert check(replay)
+    stored = ReplayIndex(replay)
+    rebuilt = ReplayIndex(replay, interval=50)
+    for index in range(replay.ticks // replay.interval + 1):
+        body, *rest = replay.keyframe(index)
+        state = rebuilt.state(index * replay.interval)
+        snapshot = state.snapshot()
+        assert (list(body), *rest) == (list(snapshot[0]), *snapshot[1:])
+    for tick in (0, 99, 100, 101, replay.ticks):
+        a, b = stored.state(tick), rebuilt.state(tick)
+        assert (list(a.body), a.apple, a.tick) == (list(b.body), b.apple, tick)
+
+
+def test_version_2_is_still_read():
+    data = record("a_star", 0)
+    replay = Replay(data)
+    # Même partie en version 2: l'en-tête sans images clés, puis les coups, pommes et séries
+    end = HEADER.size + len(replay.moves) + 4 * len(replay.apples) + 4 * len(replay.stays)
+    old = bytearray(HEADER_V2.pack(*HEADER.unpack_from(data, 0)[:11]) + data[HEADER.size:end])
+    old[4] = 2
+    previous = Replay(bytes(old))
+    assert previous.interval is None
+    assert check(previous)
+    assert list(ReplayIndex(previous).state(replay.ticks).body) == list(ReplayIndex(replay).state(replay.ticks).body)
@@ -0,0 +1,21 @@
+import pytest
+
+from board import Board
+from headless import run_game
+
+
+@pytest.mark.parametrize("size", [(2, 2), (4, 2), (2, 4), (4, 3), (3, 4), (4, 4), (6, 4), (5, 4), (6, 6)])
+def test_shortcuts_fill_small_boards(size):
+    # Les plateaux où les raccourcis mouraient le plus: chaque partie doit remplir le plateau
+    for seed in range(200):
+        result = run_game("shortcut", 10 ** 6, seed=seed, board=Board(*size))
+        assert not result["died"], seed
+        assert result["complete"], seed
+
+
+def test_shortcuts_beat_the_cycle():
+    board = Board(10, 10)
+    shortcut = run_game("shortcut", 10 ** 6, seed=0, board=board)
+    cycle = run_game("hamiltonian", 10 ** 6, seed=0, board=board)
+    assert shortcut["complete"] and cycle["complete"]
+    assert shortcut["steps"] < cycle["steps"]
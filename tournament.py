@@ -0,0 +1,121 @@
+"""Tournament between the A*, Hamiltonian, shortcut and Fusion strategies.
+
+Plays seeded headless games of every strategy in a process pool and prints
+the results as games finish, then a per-strategy summary: mean score,
+steps per apple, deaths, boards filled and wall time.
+
+    python tournament.py --games 10000 --max-steps 5000 --out results.jsonl
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import time
+
+from board import DEFAULT_BOARD, Board
+from headless import STRATEGIES, run_game
+
+
+def play(task):
+    strategy, seed, max_steps, board = task
+    return run_game(strategy, max_steps, seed=seed, board=board)
+
+
+class Summary:
+    def __init__(self, strategy):
+        self.strategy = strategy
+        self.games = 0
+        self.score = 0
+        self.steps = 0
+        self.deaths = 0
+        self.completed = 0
+        self.time = 0.0
+
+    def add(self, result):
+        self.games += 1
+        self.score += result["score"]
+        self.steps += result["steps"]
+        self.deaths += result["died"]
+        self.completed += result["complete"]
+        self.time += result["time"]
+
+    def row(self):
+        mean_score = self.score / self.games if self.games else 0.0
+        steps_per_apple = self.steps / self.score if self.score else float("inf")
+        return "{0:<12} {1:>7} {2:>10.2f} {3:>10.1f} {4:>7} {5:>7} {6:>10.1f}".format(
+            self.strategy, self.games, mean_score, steps_per_apple, self.deaths, self.completed, self.time
+        )
+
+
+HEADER = "{0:<12} {1:>7} {2:>10} {3:>10} {4:>7} {5:>7} {6:>10}".format(
+    "strategy", "games", "score", "steps/app", "deaths", "full", "cpu (s)"
+)
+
+
+def run_tournament(strategies, games, max_steps=10000, seed=0, processes=None, out=None, progress=True,
+                   board=DEFAULT_BOARD):
+    """Play ``games`` games of each strategy on ``board`` and return the summaries by strategy.
+
+    Game ``i`` of every strategy uses the seed ``seed + i``, so all strategies
+    face the same first apples. Results are written to ``out`` (one JSON
+    object per line) as soon as each game finishes.
+    """
+    tasks = [(strategy, seed + i, max_steps, board) for i in range(games) for strategy in strategies]
+    summaries = {strategy: Summary(strategy) for strategy in strategies}
+    processes = processes or os.cpu_count()
+    chunksize = max(1, len(tasks) // (processes * 16))
+
+    start = time.perf_counter()
+    with multiprocessing.Pool(processes) as pool:
+        for done, result in enumerate(pool.imap_unordered(play, tasks, chunksize), 1):
+            summaries[result["strategy"]].add(result)
+            if out is not None:
+                out.write(json.dumps(result) + "\n")
+                out.flush()
+            if progress:
+                print(
+                    "[{0}/{1}] {2} seed {3}: score {4} steps {5} died {6}".format(
+                        done, len(tasks), result["strategy"], result["seed"],
+                        result["score"], result["steps"], result["died"],
+                    )
+                )
+    elapsed = time.perf_counter() - start
+
+    print(HEADER)
+    for summary in summaries.values():
+        print(summary.row())
+    print("wall time {0:.1f}s on {1} processes".format(elapsed, processes))
+    return summaries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the snake strategies over many seeded games.")
+    parser.add_argument("strategies", nargs="*", help="default: all of " + ", ".join(sorted(STRATEGIES)))
+    parser.add_argument("--games", type=int, default=100, help="games per strategy")
+    parser.add_argument("--max-steps", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--width", type=int, default=DEFAULT_BOARD.width, help="board width in cells")
+    parser.add_argument("--height", type=int, default=DEFAULT_BOARD.height, help="board height in cells")
+    parser.add_argument("--out", default=None, help="write every game result to this JSON lines file")
+    parser.add_argument("--quiet", action="store_true", help="only print the summary")
+    args = parser.parse_args()
+    strategies = args.strategies or sorted(STRATEGIES)
+    for strategy in strategies:
+        if strategy not in STRATEGIES:
+            parser.error("unknown strategy {0!r}".format(strategy))
+
+    out = open(args.out, "w") if args.out else None
+    try:
+        run_tournament(
+            strategies, args.games, args.max_steps, args.seed,
+            args.processes, out, progress=not args.quiet,
+            board=Board(args.width, args.height),
+        )
+    finally:
+        if out is not None:
+            out.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Replay viewer: plays a replay log in a pygame window, forward or backward.
+
+The log is memory-mapped and states are rebuilt from the keyframes written
+in it, through a ``replay.ReplayIndex``, so any tick is reached in constant
+time, without reading the whole file or running the planner again.
+
+    python viewer.py replays/a_star-7.snkr --end
+
+Keys: space pauses, left/right step one tick, page up/down jump 1000 ticks,
+home/end go to the first/last tick (the death), up/down double or halve the
+speed, R reverses the playback.
+"""
+import argparse
+
+import pygame
+
+from board import Board
+from render import DirtyRenderer
+from replay import Replay, ReplayIndex
+
+GREEN = (0, 255, 0)
+RED = (255, 0, 0)
+
+
+class ReplaySnake:
+    # Le corps d'un ReplayState, sous la forme attendue par DirtyRenderer
+    color = GREEN
+
+    def __init__(self, body):
+        self.positions = body
+
+    def layers(self):
+        return [(self.positions, self.color, True)]
+
+
+class ReplayApple:
+    color = RED
+
+    def __init__(self, position):
+        self.position = position
+
+
+class Viewer:
+    def __init__(self, replay, board, speed=100.0, interval=None):
+        self.replay = replay
+        self.board = board
+        self.index = ReplayIndex(replay, interval)
+        self.position = 0.0  # tick affiché, fractionnaire pour les vitesses lentes
+        self.speed = speed  # ticks par seconde, négatif en arrière
+        self.paused = False
+
+    @property
+    def tick(self):
+        return int(self.position)
+
+    def seek(self, tick):
+        self.position = float(max(0, min(tick, self.replay.ticks)))
+
+    def advance(self, seconds):
+        if not self.paused:
+            self.seek(self.position + self.speed * seconds)
+            if self.position in (0, self.replay.ticks):
+                self.paused = True  # arrêt aux extrémités
+
+    def handle(self, key):
+        if key == pygame.K_SPACE:
+            self.paused = not self.paused
+        elif key == pygame.K_RIGHT:
+            self.paused = True
+            self.seek(self.tick + 1)
+        elif key == pygame.K_LEFT:
+            self.paused = True
+            self.seek(self.tick - 1)
+        elif key == pygame.K_PAGEUP:
+            self.seek(self.tick + 1000)
+        elif key == pygame.K_PAGEDOWN:
+            self.seek(self.tick - 1000)
+        elif key == pygame.K_HOME:
+            self.seek(0)
+        elif key == pygame.K_END:
+            self.seek(self.replay.ticks)
+        elif key == pygame.K_UP:
+            self.speed *= 2
+        elif key == pygame.K_DOWN:
+            self.speed /= 2
+        elif key == pygame.K_r:
+            self.speed = -self.speed
+            self.paused = False
+
+    def lines(self, state):
+        replay = self.replay
+        end = " (died next)" if replay.died and state.tick == replay.ticks else ""
+        return [
+            "Tick {0}/{1}{2}".format(state.tick, replay.ticks, end),
+            "Score {0} x{1:g}{2}".format(state.eaten, self.speed, " paused" if self.paused else ""),
+        ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a snake replay.")
+    parser.add_argument("path")
+    parser.add_argument("--tick", type=int, default=0, help="tick to start at")
+    parser.add_argument("--end", action="store_true", help="start at the last tick")
+    parser.add_argument("--speed", type=float, default=100.0, help="ticks per second")
+    parser.add_argument("--cell-size", type=int, default=20)
+    parser.add_argument("--fps", type=int, default=60)
+    args = parser.parse_args()
+
+    replay = Replay.open(args.path)
+    board = Board(replay.board.width, replay.board.height, args.cell_size)
+    viewer = Viewer(replay, board, args.speed)
+    viewer.seek(replay.ticks if args.end else args.tick)
+
+    pygame.init()
+    pygame.font.init()
+    screen = pygame.display.set_mode((board.screen_width, board.screen_height))
+    pygame.display.set_caption("{0} seed {1}".format(replay.strategy, replay.seed))
+    renderer = DirtyRenderer(screen, board)
+    clock = pygame.time.Clock()
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return
+            elif event.type == pygame.KEYDOWN:
+                viewer.handle(event.key)
+
+        state = viewer.index.state(viewer.tick)
+        renderer.render(ReplaySnake(state.body), ReplayApple(state.apple), viewer.lines(state))
+        viewer.advance(clock.tick(args.fps) / 1000.0)
+
+
+if __name__ == "__main__":
+    main()